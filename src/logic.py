@@ -7,10 +7,15 @@ Contains data clients (Sheets, TSV) and comparison algorithms.
 from __future__ import annotations
 import os
 import re
+import csv
+import sys
 import time
 import random
+import colorsys
 import datetime as dt
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Tuple, Any, Optional
 
 # --- Google Sheets ---
@@ -25,45 +30,91 @@ WHITE = {"red": 1.0, "green": 1.0, "blue": 1.0}
 
 # --- Helpers ---
 _money_re = re.compile(r"[€$£₤¥₩₹ƒ'ª¶œ]\s*")
-_only_digits_comma_dot = re.compile(r"^[\d\.,]+$")
+# Locale-normalization tables: one translate() pass instead of chained replace().
+_de_decimal = str.maketrans({".": "", ",": "."})  # 1.000,00 -> 1000.00
+_drop_commas = str.maketrans({",": ""})           # 1,000.00 -> 1000.00
+_drop_dots = str.maketrans({".": ""})             # 1.000.000 -> 1000000
+_comma_to_dot = str.maketrans({",": "."})         # 1,5 -> 1.5
+# One alternative per supported date format, ordered like the old strptime loop:
+# %Y-%m-%d | %d.%m.%Y | %m/%d/%Y (then %d/%m/%Y) | %Y/%m/%d
+_date_re = re.compile(
+    r"^(?:(\d{4})-(\d{1,2})-(\d{1,2})"
+    r"|(\d{1,2})\.(\d{1,2})\.(\d{4})"
+    r"|(\d{1,2})/(\d{1,2})/(\d{4})"
+    r"|(\d{4})/(\d{1,2})/(\d{1,2}))$"
+)
+
+_currency_chars = frozenset("€$£₤¥₩₹ƒ'ª¶œ")
+
+def _scan_number(s: str) -> Optional[Tuple[str, int, int, int, int]]:
+    """Single pass over s replacing the money-strip regex, the digits/comma/dot
+    regex and both rfind calls. Skips currency chars (and whitespace right
+    after them, like _money_re did) while counting and locating separators.
+    Returns (cleaned, comma_count, dot_count, last_comma, last_dot), or None
+    if any other character appears."""
+    out = []
+    commas = dots = 0
+    last_comma = last_dot = -1
+    skip_ws = False      # inside the whitespace run after a currency char
+    pending_ws = False   # bare whitespace; only ok before a trailing currency
+    tail_only = False    # seen "<ws><currency>": nothing but currency may follow
+    for ch in s:
+        if ch in _currency_chars:
+            if pending_ws:
+                pending_ws = False
+                tail_only = True
+            skip_ws = True
+            continue
+        if ch.isspace():
+            if skip_ws: continue
+            pending_ws = True
+            continue
+        skip_ws = False
+        if pending_ws or tail_only: return None
+        if ch == ",":
+            commas += 1; last_comma = len(out); out.append(ch)
+        elif ch == ".":
+            dots += 1; last_dot = len(out); out.append(ch)
+        elif "0" <= ch <= "9":
+            out.append(ch)
+        else:
+            return None
+    if not out: return None
+    return "".join(out), commas, dots, last_comma, last_dot
 
 def _to_number_if_possible(val: Any) -> Any:
     if val is None: return None
     if isinstance(val, (int, float)): return float(val)
     s = str(val).strip()
     if not s: return ""
-    s = _money_re.sub("", s).strip()
-    
-    if _only_digits_comma_dot.match(s):
-        # Check for multiple occurrences of separators (indicates thousands)
-        comma_count = s.count(",")
-        dot_count = s.count(".")
-        
-        if comma_count > 1 and dot_count == 0:
-            # English millions: 1,000,000 -> 1000000
-            return float(s.replace(",", ""))
-        if dot_count > 1 and comma_count == 0:
-            # German millions: 1.000.000 -> 1000000
-            return float(s.replace(".", ""))
-            
-        last_comma = s.rfind(",")
-        last_dot = s.rfind(".")
-        
-        if last_comma > -1 and last_dot > -1:
-            # Both present: determine which is decimal based on position
-            if last_comma > last_dot: 
-                # German: 1.000,00 -> 1000.00
-                s = s.replace(".", "").replace(",", ".")
-            else: 
-                # English: 1,000.00 -> 1000.00
-                s = s.replace(",", "")
-        elif last_comma > -1:
-            # Only comma. Ambiguous: 1,000 (Eng) or 1,5 (Ger)
-            # We assume German decimal (1,5 -> 1.5) as it's safer for currency
-            s = s.replace(",", ".")
-            
-        try: return float(s)
-        except Exception: pass
+
+    scanned = _scan_number(s)
+    if scanned is None:
+        # Not digits/separators: same last resort as before the scanner.
+        try: return float(_money_re.sub("", s).strip())
+        except Exception: return val
+    s, comma_count, dot_count, last_comma, last_dot = scanned
+
+    if comma_count > 1 and dot_count == 0:
+        # English millions: 1,000,000 -> 1000000
+        return float(s.translate(_drop_commas))
+    if dot_count > 1 and comma_count == 0:
+        # German millions: 1.000.000 -> 1000000
+        return float(s.translate(_drop_dots))
+
+    if last_comma > -1 and last_dot > -1:
+        # Both present: determine which is decimal based on position
+        if last_comma > last_dot:
+            # German: 1.000,00 -> 1000.00
+            s = s.translate(_de_decimal)
+        else:
+            # English: 1,000.00 -> 1000.00
+            s = s.translate(_drop_commas)
+    elif last_comma > -1:
+        # Only comma. Ambiguous: 1,000 (Eng) or 1,5 (Ger)
+        # We assume German decimal (1,5 -> 1.5) as it's safer for currency
+        s = s.translate(_comma_to_dot)
+
     try: return float(s)
     except Exception: return val
 
@@ -72,62 +123,160 @@ def _to_date_iso_if_possible(val: Any) -> Any:
     if isinstance(val, dt.date): return val.isoformat()
     s = str(val).strip()
     if not s: return ""
-    for f in ["%Y-%m-%d", "%d.%m.%Y", "%m/%d/%Y", "%d/%m/%Y", "%Y/%m/%d"]:
-        try: return dt.datetime.strptime(s, f).date().isoformat()
-        except Exception: continue
-    return val
+    m = _date_re.match(s)
+    if not m: return val
+    g = m.groups()
+    try:
+        if g[0]: return dt.date(int(g[0]), int(g[1]), int(g[2])).isoformat()
+        if g[3]: return dt.date(int(g[5]), int(g[4]), int(g[3])).isoformat()
+        if g[6]:
+            # Slash dates are ambiguous: try %m/%d/%Y first, then %d/%m/%Y,
+            # matching the precedence of the old strptime loop.
+            a, b, y = int(g[6]), int(g[7]), int(g[8])
+            try: return dt.date(y, a, b).isoformat()
+            except ValueError: return dt.date(y, b, a).isoformat()
+        return dt.date(int(g[9]), int(g[10]), int(g[11])).isoformat()
+    except ValueError:
+        return val
+
+@lru_cache(maxsize=1 << 20)
+def _normalize_cell_cached(val: Any) -> Any:
+    v = _to_date_iso_if_possible(val)
+    if v is not val: return v
+    v2 = _to_number_if_possible(val)
+    if isinstance(v2, float): return round(v2, 10)
+    return str(val).strip()
 
 def normalize_cell(val: Any) -> Any:
     if val is None: return ""
+    # Unformatted API values arrive as native numbers; skip parsing entirely.
+    if type(val) is float: return round(val, 10)
+    if type(val) is int: return float(val)
+    # Sheet data repeats heavily (empty cells, category labels), so cache by raw value.
+    # gspread/TSV deliver strings, so dispatch those without the try frame;
+    # anything else unusual but hashable still benefits from the cache.
+    if type(val) is str:
+        return _normalize_cell_cached(val)
+    try:
+        return _normalize_cell_cached(val)
+    except TypeError:
+        pass
     v = _to_date_iso_if_possible(val)
     if v is not val: return v
     v2 = _to_number_if_possible(val)
     if isinstance(v2, float): return round(v2, 10)
     return str(val).strip()
 
-def a1_cell(row0: int, col0: int) -> str:
-    """Converts 0-based row/col to A1 notation."""
+def _col_label(col0: int) -> str:
     s, n = "", col0 + 1
     while n > 0: n, r = divmod(n - 1, 26); s = chr(65 + r) + s
-    return f"{s}{row0 + 1}"
+    return s
+
+# A..ZZ precomputed; a1_cell is called once per diff/report line.
+_COL_LABELS = [_col_label(i) for i in range(702)]
+
+def a1_cell(row0: int, col0: int) -> str:
+    """Converts 0-based row/col to A1 notation."""
+    # try/except is free when the label exists, which is every call but the
+    # first past ZZ; the len() guard it replaces cost a check per call.
+    try:
+        return f"{_COL_LABELS[col0]}{row0 + 1}"
+    except IndexError:
+        _COL_LABELS.extend(_col_label(i) for i in range(len(_COL_LABELS), col0 + 1))
+        return f"{_COL_LABELS[col0]}{row0 + 1}"
 
 def rgb_to_hsv(r, g, b):
-    max_c = max(r, g, b)
-    min_c = min(r, g, b)
-    diff = max_c - min_c
-    h = s = v = 0
-    v = max_c
-    if max_c > 0:
-        s = diff / max_c
-    if diff > 0:
-        if max_c == r: h = (g - b) / diff
-        elif max_c == g: h = 2 + (b - r) / diff
-        else: h = 4 + (r - g) / diff
-        h *= 60
-        if h < 0: h += 360
-    return h, s, v
+    # Delegates to stdlib colorsys; h is 0..1 here (the old hand-rolled
+    # version used degrees) and callers only round-trip it into hsv_to_rgb.
+    return colorsys.rgb_to_hsv(r, g, b)
 
 def hsv_to_rgb(h, s, v):
-    if s == 0: return v, v, v
-    h /= 60
-    i = int(h)
-    f = h - i
-    p = v * (1 - s)
-    q = v * (1 - s * f)
-    t = v * (1 - s * (1 - f))
-    if i == 0: return v, t, p
-    if i == 1: return q, v, p
-    if i == 2: return p, v, t
-    if i == 3: return p, q, v
-    if i == 4: return t, p, v
-    return v, p, q
+    return colorsys.hsv_to_rgb(h, s, v)
+
+@lru_cache(maxsize=4096)
+def dim_color(r: float, g: float, b: float) -> Tuple[float, float, float]:
+    """One dimming step for a cell background: desaturate by DIM_BLEND_FACTOR
+    and nudge value so bright colors fade toward a pale steady state.
+
+    Cached per distinct RGB triple — a sheet has thousands of colored cells
+    but only a handful of distinct colors (the base palette plus their dim
+    steps), so the HSV round-trip runs once per color, not once per cell.
+    """
+    h, s, v = colorsys.rgb_to_hsv(r, g, b)
+    new_s = max(0.0, s - DIM_BLEND_FACTOR)
+    if new_s < 0.01:
+        return (1.0, 1.0, 1.0)  # fully faded: snap to white
+    if s > 0.85: new_v = v - 0.18
+    elif s > 0.45: new_v = v - 0.05
+    elif s > 0.15: new_v = v + 0.05
+    else: new_v = min(1.0, v + (0.15 - new_s) * 1.8)
+    new_v = max(0.0, min(1.0, new_v))
+    return colorsys.hsv_to_rgb(h, new_s, new_v)
 
 def is_white(color: Optional[Dict[str, float]]) -> bool:
     if not color: return True
-    r = color.get('red', 0.0)
-    g = color.get('green', 0.0)
-    b = color.get('blue', 0.0)
-    return r > 0.9 and g > 0.9 and b > 0.9
+    # Short-circuits on the first non-white channel.
+    return (color.get('red', 0.0) > 0.9 and
+            color.get('green', 0.0) > 0.9 and
+            color.get('blue', 0.0) > 0.9)
+
+def _coalesce_value_updates(updates: List[Tuple[int, int, Any]]) -> List[List[Any]]:
+    """Groups (row0, col0, value) updates into vertical runs of consecutive rows
+    per column. Returns [start_row0, col0, [v0, v1, ...]] runs."""
+    runs: List[List[Any]] = []
+    for r, c, v in sorted(updates, key=lambda u: (u[1], u[0])):
+        if runs and runs[-1][1] == c and runs[-1][0] + len(runs[-1][2]) == r:
+            runs[-1][2].append(v)
+        else:
+            runs.append([r, c, [v]])
+    return runs
+
+def _coalesce_value_updates_by_row(updates: List[Tuple[int, int, Any]]) -> List[List[Any]]:
+    """Groups (row0, col0, value) updates into horizontal runs of consecutive
+    columns per row. Returns [row0, start_col0, [v0, v1, ...]] runs."""
+    runs: List[List[Any]] = []
+    for r, c, v in sorted(updates, key=lambda u: (u[0], u[1])):
+        if runs and runs[-1][0] == r and runs[-1][1] + len(runs[-1][2]) == c:
+            runs[-1][2].append(v)
+        else:
+            runs.append([r, c, [v]])
+    return runs
+
+def _coalesce_color_cells(cells: List[Tuple[int, int, Dict]]) -> List[Tuple[int, int, int, int, Dict]]:
+    """Merges per-cell (row0, col0, color) entries into same-color rectangles.
+    Returns (start_row0, end_row0, start_col0, end_col0, color) with half-open
+    ranges, each worth one repeatCell request instead of one per cell.
+
+    Cells are run-length encoded into horizontal runs per row first, then
+    vertically adjacent rows with an identical run are merged. Colors are
+    keyed by their RGB triple rounded to 3 decimals."""
+    runs: List[List[Any]] = []  # [key, row, c0, c1, color]
+    keyed = [((round(color.get("red", 0.0), 3), round(color.get("green", 0.0), 3),
+               round(color.get("blue", 0.0), 3)), r, c, color) for r, c, color in cells]
+    for key, r, c, color in sorted(keyed, key=lambda t: t[:3]):
+        if runs and runs[-1][0] == key and runs[-1][1] == r and runs[-1][3] == c:
+            runs[-1][3] = c + 1
+        else:
+            runs.append([key, r, c, c + 1, color])
+    rects: List[List[Any]] = []  # [key, r0, r1, c0, c1, color]
+    for key, r, c0, c1, color in sorted(runs, key=lambda t: (t[0], t[2], t[3], t[1])):
+        if rects and rects[-1][0] == key and rects[-1][3] == c0 and rects[-1][4] == c1 and rects[-1][2] == r:
+            rects[-1][2] = r + 1
+        else:
+            rects.append([key, r, r + 1, c0, c1, color])
+    return [(r0, r1, c0, c1, color) for _, r0, r1, c0, c1, color in rects]
+
+def _reassemble_column_rows(n_headers: int, col_idxs: List[int], col_values: List[List[List[Any]]]) -> List[List[Any]]:
+    """Rebuilds full-width rows from per-column batch_get results (one list of
+    single-cell rows per requested column), so column indices in the output
+    still line up with the header row. Unfetched columns are empty strings;
+    short columns are padded to the longest one."""
+    n_rows = max((len(cv) for cv in col_values), default=0)
+    rows = [[""] * n_headers for _ in range(n_rows)]
+    for idx, cv in zip(col_idxs, col_values):
+        for r, cell in enumerate(cv):
+            rows[r][idx] = cell[0] if cell else ""
+    return rows
 
 def _prepare_for_write(val: Any):
     num = _to_number_if_possible(val)
@@ -144,38 +293,93 @@ class SheetsClient:
         scope = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
         creds = Credentials.from_service_account_file(credentials_path, scopes=scope)
         self.gc = gspread.authorize(creds)
+        self._sheet_cache: Dict[str, gspread.Spreadsheet] = {}
+        self._ws_cache: Dict[Tuple[str, str], gspread.Worksheet] = {}
+        self._min_interval = 0.0  # raised to WRITE_DELAY once the API returns a 429
+        self._last_call = 0.0
 
     def _retry_api(self, func, *args, **kwargs):
+        last_err = None
         for attempt in range(5):
+            # No unconditional delay: pace calls only once the API has pushed
+            # back with a 429 in this session.
+            pace = self._min_interval - (time.monotonic() - self._last_call)
+            if pace > 0: time.sleep(pace)
+            self._last_call = time.monotonic()
             try:
-                time.sleep(WRITE_DELAY)
                 return func(*args, **kwargs)
             except gspread.exceptions.APIError as e:
                 err_str = str(e)
                 if any(code in err_str for code in ["429", "500", "503"]):
+                    if "429" in err_str: self._min_interval = WRITE_DELAY
+                    last_err = e
                     wait = (2 ** attempt) + random.uniform(0, 1)
                     print(f"API Error ({err_str}), retrying in {wait:.2f}s...")
                     time.sleep(wait)
                     continue
                 raise
-        raise
+        # Retries exhausted: surface the last retryable error instead of a
+        # bare re-raise outside an except block.
+        raise last_err
 
     def _open_sheet(self, spreadsheet_id_or_name: str) -> gspread.Spreadsheet:
-        try: return self.gc.open_by_key(spreadsheet_id_or_name)
-        except gspread.SpreadsheetNotFound: return self.gc.open(spreadsheet_id_or_name)
+        # open/open_by_key hit the Drive API every time; one action opens the
+        # same spreadsheet several times, so keep the handle for the session.
+        sh = self._sheet_cache.get(spreadsheet_id_or_name)
+        if sh is None:
+            try: sh = self.gc.open_by_key(spreadsheet_id_or_name)
+            except gspread.SpreadsheetNotFound: sh = self.gc.open(spreadsheet_id_or_name)
+            self._sheet_cache[spreadsheet_id_or_name] = sh
+        return sh
+
+    def _worksheet(self, spreadsheet_id: str, worksheet_title: str) -> gspread.Worksheet:
+        # sh.worksheet() fetches the sheet list each time; resolve once per tab.
+        ws = self._ws_cache.get((spreadsheet_id, worksheet_title))
+        if ws is None:
+            ws = self._open_sheet(spreadsheet_id).worksheet(worksheet_title)
+            self._ws_cache[(spreadsheet_id, worksheet_title)] = ws
+        return ws
 
     def list_worksheets(self, spreadsheet_id: str) -> List[str]:
-        return [ws.title for ws in self._open_sheet(spreadsheet_id).worksheets()]
-
-    def fetch_values(self, spreadsheet_id: str, worksheet_title: str) -> Tuple[List[str], List[List[Any]]]:
-        ws = self._open_sheet(spreadsheet_id).worksheet(worksheet_title)
-        values = self._retry_api(ws.get_all_values)
-        return ([h.strip() for h in values[0]], values[1:]) if values else ([], [])
+        # worksheets() already returns every tab's properties (including
+        # row/col counts) in one metadata call; warm the handle cache with
+        # them so later per-tab lookups skip their own metadata fetch.
+        sheets = self._open_sheet(spreadsheet_id).worksheets()
+        for ws in sheets:
+            self._ws_cache[(spreadsheet_id, ws.title)] = ws
+        return [ws.title for ws in sheets]
+
+    def fetch_values(self, spreadsheet_id: str, worksheet_title: str, columns: Optional[List[str]] = None, unformatted: bool = False) -> Tuple[List[str], List[List[Any]]]:
+        """Fetches (headers, rows) for a worksheet.
+
+        With unformatted=True, values come back as native JSON numbers
+        (UNFORMATTED_VALUE), so numeric cells skip locale parsing client-side.
+        Caveat: date cells then arrive as serial numbers, so only use it for
+        sheets where compared columns are text/numeric.
+        """
+        ws = self._worksheet(spreadsheet_id, worksheet_title)
+        if columns is None:
+            if unformatted:
+                values = self._retry_api(ws.get_values, value_render_option="UNFORMATTED_VALUE")
+            else:
+                values = self._retry_api(ws.get_all_values)
+            return ([str(h).strip() for h in values[0]], values[1:]) if values else ([], [])
+        # Column-restricted path: fetch the header row, then only the columns
+        # the caller cares about, skipping the payload for everything else.
+        header_vals = self._retry_api(ws.get_values, "1:1")
+        headers = [h.strip() for h in header_vals[0]] if header_vals else []
+        if not headers: return [], []
+        wanted = {c.strip() for c in columns}
+        col_idxs = [i for i, h in enumerate(headers) if h in wanted]
+        if not col_idxs: return headers, []
+        ranges = [f"{_col_label(i)}2:{_col_label(i)}" for i in col_idxs]
+        col_values = self._retry_api(ws.batch_get, ranges)
+        return headers, _reassemble_column_rows(len(headers), col_idxs, col_values)
 
     def fetch_formats(self, spreadsheet_id: str, worksheet_title: str) -> List[Dict]:
         sh = self._open_sheet(spreadsheet_id)
-        ws = sh.worksheet(worksheet_title)
-        end_col = gspread.utils.rowcol_to_a1(1, ws.col_count).rstrip('1')
+        ws = self._worksheet(spreadsheet_id, worksheet_title)
+        end_col = _col_label(ws.col_count - 1)
         fetch_range = f"'{worksheet_title}'!A2:{end_col}"
         params = {
             'ranges': fetch_range,
@@ -191,6 +395,52 @@ class SheetsClient:
             print(f"Error fetching formats: {e}")
             return []
 
+    def fetch_values_and_formats(self, spreadsheet_id: str, worksheet_title: str) -> Tuple[List[str], List[List[Any]], List[Dict]]:
+        """Fetches headers, data rows and background formats in a single API call.
+
+        Returns (headers, rows, formats) where formats covers the data rows only,
+        matching what fetch_formats returns.
+        """
+        sh = self._open_sheet(spreadsheet_id)
+        params = {
+            'ranges': f"'{worksheet_title}'",
+            'includeGridData': True,
+            'fields': 'sheets.data(startRow,startColumn,rowData.values(formattedValue,effectiveFormat.backgroundColor))',
+        }
+        meta = self._retry_api(sh.fetch_sheet_metadata, params=params)
+        try:
+            row_data = meta['sheets'][0]['data'][0].get('rowData', [])
+        except (KeyError, IndexError):
+            row_data = []
+        if not row_data: return [], [], []
+
+        def row_values(rd):
+            return [(c.get('formattedValue') or '') if c else '' for c in rd.get('values', [])]
+
+        headers = [h.strip() for h in row_values(row_data[0])]
+        rows = [row_values(rd) for rd in row_data[1:]]
+        return headers, rows, row_data[1:]
+
+    def fetch_all_for_compare(self, src_id: str, src_title: str, tgt_id: str, tgt_title: str) -> Tuple[List[str], List[List[Any]], List[Dict], List[str], List[List[Any]], List[Dict]]:
+        """Fetches values and formats for source and target in parallel.
+
+        The four reads are independent I/O, so a small thread pool overlaps
+        their round-trip latency instead of serializing them.
+        Returns (s_headers, s_rows, s_formats, t_headers, t_rows, t_formats).
+        """
+        # Open both spreadsheets up front so the handle cache isn't mutated
+        # concurrently from worker threads.
+        self._open_sheet(src_id)
+        self._open_sheet(tgt_id)
+        with ThreadPoolExecutor(max_workers=4) as ex:
+            fv_s = ex.submit(self.fetch_values, src_id, src_title)
+            ff_s = ex.submit(self.fetch_formats, src_id, src_title)
+            fv_t = ex.submit(self.fetch_values, tgt_id, tgt_title)
+            ff_t = ex.submit(self.fetch_formats, tgt_id, tgt_title)
+        s_h, s_r = fv_s.result()
+        t_h, t_r = fv_t.result()
+        return s_h, s_r, ff_s.result(), t_h, t_r, ff_t.result()
+
     def batch_update(self, spreadsheet_id: str, body: Dict):
         if not body.get('requests'): return
         sh = self._open_sheet(spreadsheet_id)
@@ -198,22 +448,40 @@ class SheetsClient:
 
     def batch_update_values(self, spreadsheet_id: str, worksheet_title: str, updates: List[Tuple[int, int, Any]]):
         if not updates: return
-        sh = self._open_sheet(spreadsheet_id)
-        ws = sh.worksheet(worksheet_title)
-        data = [{"range": f"'{ws.title}'!{a1_cell(r, c)}", "values": [[_prepare_for_write(v)]]} for r, c, v in updates]
+        ws = self._worksheet(spreadsheet_id, worksheet_title)
+        # Coalesce runs into one rectangular range each; fewer, larger ranges
+        # mean less JSON to marshal and fewer cells counted per request. Try
+        # both groupings and keep whichever produces fewer entries — syncs
+        # clustered per row (diff + marker columns) favor row runs, per-column
+        # bulk edits favor column runs.
+        col_runs = _coalesce_value_updates(updates)
+        row_runs = _coalesce_value_updates_by_row(updates)
+        data = []
+        if len(row_runs) < len(col_runs):
+            for r, c0, vals in row_runs:
+                if len(vals) == 1:
+                    rng = f"'{ws.title}'!{a1_cell(r, c0)}"
+                else:
+                    rng = f"'{ws.title}'!{a1_cell(r, c0)}:{a1_cell(r, c0 + len(vals) - 1)}"
+                data.append({"range": rng, "values": [[_prepare_for_write(v) for v in vals]]})
+        else:
+            for r0, c, vals in col_runs:
+                if len(vals) == 1:
+                    rng = f"'{ws.title}'!{a1_cell(r0, c)}"
+                else:
+                    rng = f"'{ws.title}'!{a1_cell(r0, c)}:{a1_cell(r0 + len(vals) - 1, c)}"
+                data.append({"range": rng, "values": [[_prepare_for_write(v)] for v in vals]})
         self._retry_api(ws.spreadsheet.values_batch_update, body={"valueInputOption": "USER_ENTERED", "data": data})
 
     def duplicate_worksheet(self, spreadsheet_id: str, worksheet_title: str, new_title: str):
-        sh = self._open_sheet(spreadsheet_id)
-        ws = sh.worksheet(worksheet_title)
+        ws = self._worksheet(spreadsheet_id, worksheet_title)
         # Insert after the current worksheet
         self._retry_api(ws.duplicate, new_sheet_name=new_title, insert_sheet_index=ws.index + 1)
 
     def insert_rows(self, spreadsheet_id: str, worksheet_title: str, values: List[List[Any]], row_index: int):
         """Inserts multiple rows at the specified index (1-based)."""
         if not values: return
-        sh = self._open_sheet(spreadsheet_id)
-        ws = sh.worksheet(worksheet_title)
+        ws = self._worksheet(spreadsheet_id, worksheet_title)
         self._retry_api(ws.insert_rows, values, row=row_index, value_input_option="USER_ENTERED")
 
     def copy_spreadsheet(self, spreadsheet_id: str, title: str):
@@ -224,22 +492,31 @@ class SheetsClient:
 class TSVClient:
     def fetch_values(self, file_path: str) -> Tuple[List[str], List[List[Any]]]:
         if not os.path.isfile(file_path): raise FileNotFoundError(f"TSV file not found: {file_path}")
-        with open(file_path, "r", encoding="utf-8") as f: lines = [ln.rstrip("\n") for ln in f]
-        if not lines: return [], []
-        rows = [ln.split("\t") for ln in lines]
-        return [h.strip() for h in rows[0]], rows[1:]
+        # csv.reader tokenizes row-by-row in C; QUOTE_NONE keeps quote chars
+        # literal, matching the old manual split("\t") behavior.
+        with open(file_path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE, quotechar=None)
+            header_row = next(reader, None)
+            if header_row is None: return [], []
+            header = [h.strip() for h in header_row]
+            rows = list(reader)
+        return header, rows
 
 # --- Comparison Logic ---
 
 class CompareResult:
+    __slots__ = ("missing_rows_in_target", "missing_rows_in_source",
+                 "missing_columns_in_target", "missing_columns_in_source",
+                 "compared_headers", "differences", "row_mapping")
+
     def __init__(self):
         self.missing_rows_in_target: List[str] = []
         self.missing_rows_in_source: List[str] = []
         self.missing_columns_in_target: List[str] = []
         self.missing_columns_in_source: List[str] = []
         self.compared_headers: List[str] = []
-        # Dict[key, List[Tuple[header, s_val, t_val, s_row_idx, t_row_idx, s_col_idx, t_col_idx]]]
-        self.differences: Dict[str, List[Tuple[str, Any, Any, int, int, int, int]]] = {}
+        # Dict[key, Tuple[Tuple[header, s_val, t_val, s_row_idx, t_row_idx, s_col_idx, t_col_idx], ...]]
+        self.differences: Dict[str, Tuple[Tuple[str, Any, Any, int, int, int, int], ...]] = {}
         self.row_mapping: Dict[str, Tuple[int, int]] = {} # Key -> (s_row, t_row)
 
     def to_report(self) -> str:
@@ -247,8 +524,8 @@ class CompareResult:
         if self.compared_headers: lines.append("Compared columns: " + ", ".join(sorted(self.compared_headers)))
         if self.missing_columns_in_target: lines.append("Columns missing in TARGET: " + ", ".join(self.missing_columns_in_target))
         if self.missing_columns_in_source: lines.append("Columns missing in SOURCE: " + ", ".join(self.missing_columns_in_source))
-        if self.missing_rows_in_target: lines.append("\nRows missing in TARGET (SOURCE only):\n" + "\n".join(f"\t- {k}" for k in self.missing_rows_in_target))
-        if self.missing_rows_in_source: lines.append("\nRows missing in SOURCE (TARGET only):\n" + "\n".join(f"\t- {k}" for k in self.missing_rows_in_source))
+        if self.missing_rows_in_target: lines.append("\nRows missing in TARGET (SOURCE only):\n" + "\n".join(f"\t- {k}" for k in sorted(self.missing_rows_in_target)))
+        if self.missing_rows_in_source: lines.append("\nRows missing in SOURCE (TARGET only):\n" + "\n".join(f"\t- {k}" for k in sorted(self.missing_rows_in_source)))
         if self.differences:
             lines.append("\nDifferences by key/header:")
             for key, diffs in self.differences.items():
@@ -257,47 +534,72 @@ class CompareResult:
                 for header, sv, tv, _, _, _, _ in diffs: lines.append(f"\t- {header}: '{sv}' vs '{tv}'")
         return "\n".join(lines) if lines else "No differences found."
 
+@lru_cache(maxsize=32)
+def _included_set(included_h: Tuple[str, ...]) -> frozenset:
+    # The same included-columns selection is reused across compares in a
+    # session; build the stripped membership set once per distinct selection.
+    return frozenset(h.strip() for h in included_h)
+
 def compare_two_sheets(s_h, s_r, t_h, t_r, key_h, included_h):
     res = CompareResult()
-    src_hmap = {h: i for i, h in enumerate(s_h)}
-    tgt_hmap = {h: i for i, h in enumerate(t_h)}
+    # Interned headers make the many equality checks below pointer compares.
+    src_hmap = {sys.intern(h): i for i, h in enumerate(s_h)}
+    tgt_hmap = {sys.intern(h): i for i, h in enumerate(t_h)}
     if key_h not in src_hmap: raise ValueError(f"Key header '{key_h}' not found in source.")
     if key_h not in tgt_hmap: raise ValueError(f"Key header '{key_h}' not found in target.")
     
-    res.missing_columns_in_target = sorted([h for h in src_hmap if h not in tgt_hmap])
-    res.missing_columns_in_source = sorted([h for h in tgt_hmap if h not in src_hmap])
+    res.missing_columns_in_target = sorted(src_hmap.keys() - tgt_hmap.keys())
+    res.missing_columns_in_source = sorted(tgt_hmap.keys() - src_hmap.keys())
 
-    included_set = {h.strip() for h in included_h}
+    included_set = _included_set(tuple(included_h))
     common_headers = [h for h in src_hmap if h in tgt_hmap and h != key_h and h in included_set]
-    res.compared_headers = sorted(list(common_headers))
+    res.compared_headers = sorted(common_headers)
 
     def index_rows(rows, hmap):
         key_col = hmap[key_h]
+        n_cols = max(hmap.values()) + 1
         key_to_idx, key_to_vals = {}, {}
         for i, row in enumerate(rows):
-            if key_col < len(row) and (key_val := str(row[key_col]).strip()):
+            # Pad to header width first, once per row: the key access below
+            # and the diff loop then index without bounds checks.
+            if len(row) < n_cols: row = row + [""] * (n_cols - len(row))
+            key_val = row[key_col]
+            # Cells are strings except on the unformatted fetch path.
+            if type(key_val) is not str: key_val = str(key_val)
+            if key_val := key_val.strip():
                 # Store 1-based index (Header is 1, first data row is 2)
                 key_to_idx[key_val], key_to_vals[key_val] = i + 2, row
         return key_to_idx, key_to_vals
 
     src_key2idx, src_key2vals = index_rows(s_r, src_hmap)
     tgt_key2idx, tgt_key2vals = index_rows(t_r, tgt_hmap)
-    
-    src_keys, tgt_keys = set(src_key2idx.keys()), set(tgt_key2idx.keys())
-    res.missing_rows_in_target = sorted(list(src_keys - tgt_keys))
-    res.missing_rows_in_source = sorted(list(tgt_keys - src_keys))
 
-    for k in sorted(src_keys & tgt_keys):
+    # Dict-view set difference avoids materializing extra key sets. Left
+    # unsorted here: only display paths need ordering, and sync-only flows
+    # never pay the O(K log K).
+    res.missing_rows_in_target = list(src_key2idx.keys() - tgt_key2idx.keys())
+    res.missing_rows_in_source = list(tgt_key2idx.keys() - src_key2idx.keys())
+
+    # Resolve column index pairs once so the hot loop runs over plain ints
+    # instead of two dict lookups per cell.
+    col_pairs = [(h, src_hmap[h], tgt_hmap[h]) for h in common_headers]
+    norm = normalize_cell
+    tgt_idx_get = tgt_key2idx.get
+    # Iterate source keys in sheet order; the intersection set and the
+    # O(N log N) sort added nothing but report ordering.
+    for k, srow_idx in src_key2idx.items():
+        trow_idx = tgt_idx_get(k)
+        if trow_idx is None: continue
         srow, trow = src_key2vals[k], tgt_key2vals[k]
-        srow_idx, trow_idx = src_key2idx[k], tgt_key2idx[k]
         res.row_mapping[k] = (srow_idx, trow_idx)
-        diffs = []
-        for h in common_headers:
-            sc, tc = src_hmap[h], tgt_hmap[h]
-            sv = srow[sc] if sc < len(srow) else ""
-            tv = trow[tc] if tc < len(trow) else ""
-            if normalize_cell(sv) != normalize_cell(tv):
-                diffs.append((h, sv, tv, srow_idx, trow_idx, sc, tc))
+        # Single comprehension: unchanged cells (the vast majority) fail the
+        # cheap raw-equality test first and never reach normalization; the
+        # comprehension's specialized bytecode beats an append loop.
+        diffs = tuple(
+            (h, srow[sc], trow[tc], srow_idx, trow_idx, sc, tc)
+            for h, sc, tc in col_pairs
+            if srow[sc] != trow[tc] and norm(srow[sc]) != norm(trow[tc])
+        )
         if diffs: res.differences[k] = diffs
     return res
 
@@ -318,45 +620,35 @@ def check_color_status(result: CompareResult, current_formats: List[Dict], t_h:
     tgt_hmap = {h: i for i, h in enumerate(t_h)}
     included_col_indices = {tgt_hmap[h] for h in included_h if h in tgt_hmap}
 
-    # Parse current_formats (starts from row index 1, because header is row 0)
-    for r_offset, row_data in enumerate(current_formats):
-        real_row_idx = r_offset + 1 
-        if 'values' not in row_data: continue
-        
-        for c_idx, cell_data in enumerate(row_data['values']):
-            if c_idx not in included_col_indices: continue # Skip columns we aren't comparing
-            
-            if not cell_data or 'effectiveFormat' not in cell_data: continue
-            color = cell_data['effectiveFormat'].get('backgroundColor')
-            if not is_white(color):
-                actually_colored_cells.add((real_row_idx, c_idx))
-
-    # 2. Identify all cells that SHOULD be colored (Data differences)
-    should_be_colored = set()
-    # Map needed for reporting False Positives later: (row, col) -> (Key, Header)
-    cell_info_map = {} 
-
-    # Populate from result.differences
+    # Parse current_formats (starts from row index 1, because header is row 0).
+    # Walk only the included columns per row rather than enumerating every
+    # cell and filtering — wide sheets comparing a few columns skip the rest.
+    included_cols = sorted(included_col_indices)
+    add_colored = actually_colored_cells.add
+    for real_row_idx, row_data in enumerate(current_formats, start=1):
+        vals = row_data.get('values')
+        if not vals: continue
+        n_vals = len(vals)
+        for c_idx in included_cols:
+            if c_idx >= n_vals: continue
+            cell_data = vals[c_idx]
+            if not cell_data: continue
+            fmt = cell_data.get('effectiveFormat')
+            if not fmt: continue
+            if not is_white(fmt.get('backgroundColor')):
+                add_colored((real_row_idx, c_idx))
+
+    # 2. Check that every data difference is colored. The false-positive
+    # direction was dropped long ago, so there is no need to also build a
+    # should-be-colored set — only the membership test against the colored
+    # cells matters.
     for key_val, diffs in result.differences.items():
         for h, s_val, t_val, s_row, t_row, s_col, t_col in diffs:
             # t_row is 1-based
-            target_row_0based = t_row - 1
-            target_col_0based = t_col
-            
-            coord = (target_row_0based, target_col_0based)
-            should_be_colored.add(coord)
-            
-            # Check for MISSING COLOR immediately
-            if coord not in actually_colored_cells:
-                 cell_ref = a1_cell(target_row_0based, target_col_0based)
+            if (t_row - 1, t_col) not in actually_colored_cells:
+                 cell_ref = a1_cell(t_row - 1, t_col)
                  report.append(f"[MISSING COLOR] Cell {cell_ref} (Row {t_row}, {h}): Has difference but is WHITE.")
 
-    # 3. Check for FALSE POSITIVES (Colored but shouldn't be)
-    # We iterate through all colored cells found in the "Columns to Compare"
-    # REMOVED per user request: We only want to know if diffs are NOT colored.
-    # We do not care if non-diffs ARE colored (stale colors).
-    
-
     if not report:
         return ["Colors are perfectly synced with data differences."]
         
@@ -375,18 +667,16 @@ def get_color_tuple(c: Optional[Dict]) -> Tuple[float, float, float]:
     return (c.get('red', 0.0), c.get('green', 0.0), c.get('blue', 0.0))
 
 def colors_match(c1: Optional[Dict], c2: Optional[Dict], tolerance: float = 0.03) -> bool:
-    # 1. Handle White/None equivalence
-    w1 = is_white(c1)
-    w2 = is_white(c2)
-    if w1 and w2: return True
-    if w1 != w2: return False
-    
-    # 2. Compare RGB components
+    # Extract each color once; the white checks are inlined on the tuples so
+    # the dicts aren't parsed a second time via is_white.
     r1, g1, b1 = get_color_tuple(c1)
     r2, g2, b2 = get_color_tuple(c2)
-    
-    return (abs(r1 - r2) <= tolerance and 
-            abs(g1 - g2) <= tolerance and 
+    w1 = r1 > 0.9 and g1 > 0.9 and b1 > 0.9
+    w2 = r2 > 0.9 and g2 > 0.9 and b2 > 0.9
+    if w1 or w2: return w1 and w2
+
+    return (abs(r1 - r2) <= tolerance and
+            abs(g1 - g2) <= tolerance and
             abs(b1 - b2) <= tolerance)
 
 def get_color_mismatches(result: CompareResult, s_formats: List[Dict], t_formats: List[Dict], s_h: List[str], t_h: List[str], included_h: List[str]) -> List[Tuple[int, int, Dict, str]]:
@@ -396,7 +686,10 @@ def get_color_mismatches(result: CompareResult, s_formats: List[Dict], t_formats
     mismatches = []
     src_hmap = {h: i for i, h in enumerate(s_h)}
     tgt_hmap = {h: i for i, h in enumerate(t_h)}
-    
+    # Resolve header -> column indices once instead of per mapped row.
+    col_pairs = [(h, src_hmap[h], tgt_hmap[h]) for h in included_h
+                 if h in src_hmap and h in tgt_hmap]
+
     for key, (s_row, t_row) in result.row_mapping.items():
         # s_row, t_row are 1-based indices (1=Header, 2=First Data Row)
         # formats list starts from Data Row 1 (which is index 0 in list)
@@ -409,34 +702,37 @@ def get_color_mismatches(result: CompareResult, s_formats: List[Dict], t_formats
         s_row_data = s_formats[s_idx]
         t_row_data = t_formats[t_idx]
         
-        for h in included_h:
-            if h not in src_hmap or h not in tgt_hmap: continue
-            s_col = src_hmap[h]
-            t_col = tgt_hmap[h]
-            
+        for h, s_col, t_col in col_pairs:
             s_color = get_bg_color(s_row_data, s_col)
             t_color = get_bg_color(t_row_data, t_col)
-            
-            if not colors_match(s_color, t_color):
-                cell_ref = a1_cell(t_row - 1, t_col)
-                
-                s_white = is_white(s_color)
-                t_white = is_white(t_color)
-                
-                if s_white and not t_white:
-                    desc = "Source is White, Target is Colored"
-                elif not s_white and t_white:
-                    desc = "Source is Colored, Target is White"
-                else:
-                    # Both colored but different
-                    sr, sg, sb = get_color_tuple(s_color)
-                    tr, tg, tb = get_color_tuple(t_color)
-                    desc = f"RGB Mismatch: Src({sr:.2f},{sg:.2f},{sb:.2f}) vs Tgt({tr:.2f},{tg:.2f},{tb:.2f})"
-                
-                # Use WHITE constant if source is effectively white, to ensure clean write
-                final_s_color = WHITE if s_white else s_color
-                mismatches.append((t_row - 1, t_col, final_s_color, f"[COLOR DIFF] Cell {cell_ref} (Row {t_row}, {h}): {desc}"))
-                    
+
+            # Extract tuples and whiteness once; colors_match plus the
+            # description branches below would otherwise re-parse each color
+            # dict up to three times.
+            sr, sg, sb = get_color_tuple(s_color)
+            tr, tg, tb = get_color_tuple(t_color)
+            s_white = sr > 0.9 and sg > 0.9 and sb > 0.9
+            t_white = tr > 0.9 and tg > 0.9 and tb > 0.9
+
+            if s_white and t_white: continue
+            if s_white == t_white and (abs(sr - tr) <= 0.03 and
+                                       abs(sg - tg) <= 0.03 and
+                                       abs(sb - tb) <= 0.03):
+                continue
+
+            cell_ref = a1_cell(t_row - 1, t_col)
+            if s_white and not t_white:
+                desc = "Source is White, Target is Colored"
+            elif not s_white and t_white:
+                desc = "Source is Colored, Target is White"
+            else:
+                # Both colored but different
+                desc = f"RGB Mismatch: Src({sr:.2f},{sg:.2f},{sb:.2f}) vs Tgt({tr:.2f},{tg:.2f},{tb:.2f})"
+
+            # Use WHITE constant if source is effectively white, to ensure clean write
+            final_s_color = WHITE if s_white else s_color
+            mismatches.append((t_row - 1, t_col, final_s_color, f"[COLOR DIFF] Cell {cell_ref} (Row {t_row}, {h}): {desc}"))
+
     return mismatches
 
 def compare_sheet_colors(result: CompareResult, s_formats: List[Dict], t_formats: List[Dict], s_h: List[str], t_h: List[str], included_h: List[str]) -> List[str]:
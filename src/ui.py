@@ -4,8 +4,11 @@ PySide6 UI for CompareAndSyncSheets.
 """
 import os
 import json
+import queue
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 import datetime as dt
 from datetime import datetime
 from typing import Optional, List, Any, Tuple
@@ -13,14 +16,14 @@ from typing import Optional, List, Any, Tuple
 from PySide6.QtWidgets import (
     QApplication, QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout, QHBoxLayout,
     QFileDialog, QComboBox, QTextEdit, QMessageBox, QGroupBox, QFormLayout, QSplitter,
-    QProgressBar, QListWidget, QListWidgetItem, QFrame
+    QProgressBar, QListWidget, QListWidgetItem
 )
-from PySide6.QtCore import Qt, Signal, QTimer, QSize
+from PySide6.QtCore import Qt, Signal, QSignalBlocker, QTimer, QObject, QThread
 from PySide6.QtGui import QPixmap, QColor
 
 from src.logic import (
     SheetsClient, TSVClient, compare_two_sheets, check_color_status, compare_sheet_colors,
-    WHITE, DIM_BLEND_FACTOR, rgb_to_hsv, hsv_to_rgb, is_white, label_current_revision,
+    WHITE, dim_color, is_white, label_current_revision, _coalesce_color_cells,
     get_color_mismatches, get_bg_color
 )
 
@@ -39,8 +42,88 @@ BRIGHT_COLORS = {
     "Lime": {"red": 0.6, "green": 1.0, "blue": 0.0},
 }
 DEFAULT_COLOR_NAME = "Yellow"
+TABLE_CACHE_TTL = 30.0  # seconds a fetched table stays fresh for back-to-back actions
+_SANITIZE_RE = re.compile(r'[\\/*?:"<>|]')  # chars not allowed in state/log filenames
+LOG_TAIL_BYTES = 256 * 1024  # how much of a large log file gets shown in the report
+_LOG_SEP = "-" * 80 + "\n"  # line that closes every log record
 DEFAULT_COMPARE_HEADERS = ["BIDDING", "STATUS", "META", "TYPE", "TASK", "NOTES_SUP", "AI", "ALPHA", "ON-SET", "PLATE-PULL", "ASSETS"]
 
+try:
+    import orjson  # optional: faster state/session file I/O
+except ImportError:
+    orjson = None
+try:
+    import ujson  # optional: second choice when orjson is unavailable
+except ImportError:
+    ujson = None
+
+
+def _read_json(path):
+    """Parses a JSON file; binary mode with orjson so bytes feed the parser
+    directly, text mode with the stdlib fallback."""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        if ujson is not None:
+            return ujson.loads(f.read())
+        return json.load(f)
+
+
+_last_written_blob = {}  # path -> bytes of the last write, to skip no-op saves
+
+
+def _write_json(path, data):
+    """Writes `data` as indented JSON atomically: the encoded blob goes to a
+    `.tmp` sibling first and is moved into place with os.replace, so a crash
+    mid-write never leaves a truncated state file behind. orjson emits bytes
+    directly, skipping the str->bytes encode of the stdlib fallback. Writes
+    whose payload is byte-identical to the previous one are skipped."""
+    if orjson is not None:
+        blob = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    elif ujson is not None:
+        blob = ujson.dumps(data, indent=2).encode('utf-8')
+    else:
+        blob = json.dumps(data, indent=2).encode('utf-8')
+    if _last_written_blob.get(path) == blob:
+        return
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(blob)
+    os.replace(tmp_path, path)
+    _last_written_blob[path] = blob
+
+
+def _fetch_concurrently(*fns):
+    """Runs independent fetch callables concurrently and returns their results
+    in order, so source and target round-trips overlap instead of stacking."""
+    with ThreadPoolExecutor(max_workers=len(fns)) as ex:
+        futures = [ex.submit(fn) for fn in fns]
+        return [f.result() for f in futures]
+
+
+class _ActionWorker(QObject):
+    """Runs one blocking action callable off the GUI thread.
+
+    The callable receives a `progress(str)` function that appends to the
+    report window (delivered via a queued signal), and its return value is
+    handed back to the GUI thread through `finished`.
+    """
+    finished = Signal(object)
+    error = Signal(str)
+    progress = Signal(str)
+
+    def __init__(self, fn):
+        super().__init__()
+        self._fn = fn
+
+    def run(self):
+        try:
+            self.finished.emit(self._fn(self.progress.emit))
+        except Exception as e:
+            self.error.emit(str(e))
+
+
 class CompareSyncUI(QWidget):
     busy = Signal(bool)
 
@@ -49,6 +132,30 @@ class CompareSyncUI(QWidget):
         self.setWindowTitle("Google Sheets / TSV — Compare & Sync")
         self.client: Optional[SheetsClient] = None
         self.tsv = TSVClient()
+        self._action = None  # (QThread, worker) of the in-flight action
+        self._table_cache = {}  # (kind-key) -> (headers, rows, fetched_at)
+        self._status_pix = {}  # color name -> prebuilt QPixmap
+        self._state_cache = {}  # state-file path -> (mtime, parsed data)
+        self._basename_cache = None  # ((tgt_id, tgt_tab), sanitized basename)
+
+        # Debounce for state saves: actions that finish in bursts coalesce
+        # into one write shortly after the last trigger.
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(250)
+        self._save_timer.timeout.connect(self._save_ui_state)
+
+        # Log records are appended by a daemon thread draining this queue, so
+        # _write_log never blocks the GUI thread on disk I/O.
+        self._log_queue = queue.Queue()
+        self._log_thread = threading.Thread(target=self._drain_log_queue, daemon=True)
+        self._log_thread.start()
+
+        # Mirror of the compare grid (text + check state) kept in sync via
+        # itemChanged; both _get_run_params and _save_ui_state read checked
+        # headers from here, so neither ever walks Qt items.
+        self._headers: List[str] = []
+        self._check_state = bytearray()
         
         # State holders for loaded preferences before headers are actually loaded
         self.saved_compare_headers: List[str] = []
@@ -269,6 +376,9 @@ class CompareSyncUI(QWidget):
         report_layout.addWidget(self.progress)
         root_layout.addWidget(report_box, 1)
 
+        # Captured once so busy toggles don't walk the whole widget tree.
+        self._action_buttons = tuple(self.findChildren(QPushButton))
+
     def _select_all_columns(self):
         for i in range(self.compare_list.count()):
             self.compare_list.item(i).setCheckState(Qt.Checked)
@@ -277,6 +387,11 @@ class CompareSyncUI(QWidget):
         for i in range(self.compare_list.count()):
             self.compare_list.item(i).setCheckState(Qt.Unchecked)
 
+    def _on_compare_item_changed(self, item):
+        row = self.compare_list.row(item)
+        if 0 <= row < len(self._check_state):
+            self._check_state[row] = 1 if item.checkState() == Qt.Checked else 0
+
     def _wire_signals(self):
         self.busy.connect(self._set_busy)
         self.cred_btn.clicked.connect(self._pick_credentials)
@@ -284,6 +399,7 @@ class CompareSyncUI(QWidget):
         self.save_all.clicked.connect(self._save_ui_state)
         self.sel_all_btn.clicked.connect(self._select_all_columns)
         self.sel_none_btn.clicked.connect(self._select_no_columns)
+        self.compare_list.itemChanged.connect(self._on_compare_item_changed)
         self.connect_btn.clicked.connect(self._connect)
         self.src_type.currentTextChanged.connect(self._refresh_source_visibility)
         self.load_src_btn.clicked.connect(self._load_src_tabs)
@@ -313,21 +429,82 @@ class CompareSyncUI(QWidget):
         self.log_load_btn.clicked.connect(self._load_log_file)
         self.tgt_list.currentTextChanged.connect(self._on_target_change)
 
+        # Any change to what "source" or "target" means invalidates cached tables.
+        self.src_type.currentTextChanged.connect(self._invalidate_table_cache)
+        self.src_id.textChanged.connect(self._invalidate_table_cache)
+        self.src_file.textChanged.connect(self._invalidate_table_cache)
+        self.src_list.currentTextChanged.connect(self._invalidate_table_cache)
+        self.tgt_id.textChanged.connect(self._invalidate_table_cache)
+        self.tgt_list.currentTextChanged.connect(self._invalidate_table_cache)
+
+    def _append_report_block(self, lines):
+        """Appends a multi-line block to the report as a single widget update
+        instead of one relayout-and-scroll per line."""
+        self.report.setUpdatesEnabled(False)
+        try:
+            self.report.append("\n".join(lines))
+        finally:
+            self.report.setUpdatesEnabled(True)
+
     def _set_status_color(self, color: str):
-        pix = QPixmap(14, 14)
-        pix.fill(QColor(color))
+        pix = self._status_pix.get(color)
+        if pix is None:
+            pix = QPixmap(14, 14)
+            pix.fill(QColor(color))
+            self._status_pix[color] = pix
         self.status_icon.setPixmap(pix)
         
     def _set_busy(self, busy: bool):
         self.progress.setVisible(busy)
         self._set_status_color("yellow" if busy else "green")
-        for w in self.findChildren(QPushButton): 
+        for w in self._action_buttons:
             w.setEnabled(not busy)
         # Also disable inputs during busy state
         self.compare_list.setEnabled(not busy)
         self.update_marker_combo.setEnabled(not busy)
-        QApplication.processEvents()
         
+    def _run_action(self, work, on_done, error_title: str = "Error"):
+        """Runs `work(progress)` on a worker thread, then calls `on_done(result)`
+        back on the GUI thread. `work` must not touch widgets — capture any
+        widget state before calling this and report via `progress`, which
+        appends to the report window.
+
+        The completion handlers are bound methods on this widget, so Qt
+        queues their delivery onto the GUI thread (a plain closure would run
+        in the emitting worker thread). Teardown hangs off thread.finished
+        rather than happening inside the handlers, so the thread is never
+        asked to wait on itself."""
+        self.busy.emit(True)
+        thread = QThread(self)
+        worker = _ActionWorker(work)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(self.report.append)
+        worker.finished.connect(self._on_action_finished)
+        worker.error.connect(self._on_action_error)
+        worker.finished.connect(thread.quit)
+        worker.error.connect(thread.quit)
+        thread.finished.connect(self._on_action_thread_finished)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        self._action = (thread, worker, on_done, error_title)  # refs + handlers
+        thread.start()
+
+    def _on_action_finished(self, result):
+        """GUI thread: runs the current action's completion callback."""
+        on_done = self._action[2]
+        on_done(result)
+
+    def _on_action_error(self, msg: str):
+        """GUI thread: reports the current action's failure."""
+        error_title = self._action[3]
+        QMessageBox.critical(self, error_title, msg)
+        self._set_status_color("red")
+
+    def _on_action_thread_finished(self):
+        self._action = None
+        self.busy.emit(False)
+
     def _refresh_source_visibility(self, text: str):
         is_sheet = text == "Google Sheet"
         self.src_sheet_widgets.setVisible(is_sheet)
@@ -349,6 +526,7 @@ class CompareSyncUI(QWidget):
         self.busy.emit(True)
         try:
             self.client = SheetsClient(path)
+            self._invalidate_table_cache()
             self._set_status_color("green")
             QMessageBox.information(self, "Connected", "Google Sheets client authorized.")
         except Exception as e:
@@ -391,6 +569,8 @@ class CompareSyncUI(QWidget):
     def _populate_key_headers(self):
         self.busy.emit(True)
         try:
+            # "Load Headers" doubles as the explicit refresh affordance.
+            self._invalidate_table_cache()
             s_headers, _ = self._load_table("source")
             if not s_headers:
                 QMessageBox.warning(self, "No Headers", "Source has no headers.")
@@ -400,34 +580,45 @@ class CompareSyncUI(QWidget):
             current_key = self.key_header.currentText()
             
             # Populate Key Header
+            self.key_header.blockSignals(True)
             self.key_header.clear()
             self.key_header.addItems([h for h in s_headers if h])
+            self.key_header.blockSignals(False)
             if current_key in s_headers:
                 self.key_header.setCurrentText(current_key)
-                
+
             # Populate Update Marker Combo
+            self.update_marker_combo.blockSignals(True)
             self.update_marker_combo.clear()
             self.update_marker_combo.addItem("") # Allow empty selection
             self.update_marker_combo.addItems([h for h in s_headers if h])
+            self.update_marker_combo.blockSignals(False)
             if self.saved_marker_col and self.saved_marker_col in s_headers:
                  self.update_marker_combo.setCurrentText(self.saved_marker_col)
 
-            # Populate Columns to Compare (Checkboxes)
-            self.compare_list.clear()
-            for h in s_headers:
-                if not h: continue
-                item = QListWidgetItem(h)
-                item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
-                
+            # Populate Columns to Compare (Checkboxes) — one relayout for the
+            # whole grid instead of one per inserted item.
+            self.compare_list.setUpdatesEnabled(False)
+            self.compare_list.blockSignals(True)
+            self.compare_list.setResizeMode(QListWidget.Fixed)
+            try:
+                self.compare_list.clear()
                 # Check by default if in saved list, or if no saved list, check defaults
-                should_check = False
-                if self.saved_compare_headers:
-                    should_check = h in self.saved_compare_headers
-                else:
-                    should_check = h in DEFAULT_COMPARE_HEADERS
-                
-                item.setCheckState(Qt.Checked if should_check else Qt.Unchecked)
-                self.compare_list.addItem(item)
+                checked_set = set(self.saved_compare_headers) if self.saved_compare_headers else set(DEFAULT_COMPARE_HEADERS)
+                for h in s_headers:
+                    if not h: continue
+                    item = QListWidgetItem(h)
+                    item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+                    item.setCheckState(Qt.Checked if h in checked_set else Qt.Unchecked)
+                    self.compare_list.addItem(item)
+            finally:
+                self.compare_list.setResizeMode(QListWidget.Adjust)
+                self.compare_list.blockSignals(False)
+                self.compare_list.setUpdatesEnabled(True)
+
+            # Rebuild the mirror (population above runs with signals blocked).
+            self._headers = [h for h in s_headers if h]
+            self._check_state = bytearray(1 if h in checked_set else 0 for h in self._headers)
             
             self.report.append(f"Loaded {len(s_headers)} headers from source.")
         except Exception as e:
@@ -436,21 +627,40 @@ class CompareSyncUI(QWidget):
         finally:
             self.busy.emit(False)
 
-    def _load_table(self, kind: str) -> Tuple[List[str], List[List[Any]]]:
+    def _cached_fetch(self, key, fetch):
+        """Returns the cached table for `key` if still fresh, else fetches and
+        caches it. Keeps back-to-back actions (Check, then Sync) from paying
+        the same values round-trip twice."""
+        hit = self._table_cache.get(key)
+        if hit is not None and time.monotonic() - hit[2] < TABLE_CACHE_TTL:
+            return hit[0], hit[1]
+        headers, rows = fetch()
+        self._table_cache[key] = (headers, rows, time.monotonic())
+        return headers, rows
+
+    def _invalidate_table_cache(self, *_args):
+        self._table_cache.clear()
+
+    def _table_loader(self, kind: str):
+        """Reads widget state on the GUI thread and returns a no-argument
+        callable performing the actual fetch, safe to run off-thread."""
         if kind == "source":
             if self.src_type.currentText() == "Google Sheet":
-                if not self._ensure_client(): return [], []
+                if not self._ensure_client(): return lambda: ([], [])
                 sid, stab = self.src_id.text().strip(), self.src_list.currentText()
                 if not sid or not stab: raise ValueError("Source Spreadsheet/Worksheet not set.")
-                return self.client.fetch_values(sid, stab)
+                return lambda: self._cached_fetch(("sheet", sid, stab), lambda: self.client.fetch_values(sid, stab))
             filepath = self.src_file.text().strip()
             if not filepath: raise ValueError("Source TSV file path not set.")
-            return self.tsv.fetch_values(filepath)
+            return lambda: self._cached_fetch(("tsv", filepath), lambda: self.tsv.fetch_values(filepath))
         else: # target
-            if not self._ensure_client(): return [], []
+            if not self._ensure_client(): return lambda: ([], [])
             tid, ttab = self.tgt_id.text().strip(), self.tgt_list.currentText()
             if not tid or not ttab: raise ValueError("Target Spreadsheet/Worksheet not set.")
-            return self.client.fetch_values(tid, ttab)
+            return lambda: self._cached_fetch(("sheet", tid, ttab), lambda: self.client.fetch_values(tid, ttab))
+
+    def _load_table(self, kind: str) -> Tuple[List[str], List[List[Any]]]:
+        return self._table_loader(kind)()
 
     def _get_run_params(self):
         key = self.key_header.currentText().strip()
@@ -464,12 +674,8 @@ class CompareSyncUI(QWidget):
         if is_source_sheet and (not sid or not stab):
             raise ValueError("Source sheet and tab must be specified for this operation.")
             
-        included = []
-        for i in range(self.compare_list.count()):
-            item = self.compare_list.item(i)
-            if item.checkState() == Qt.Checked:
-                included.append(item.text())
-        
+        included = [h for h, checked in zip(self._headers, self._check_state) if checked]
+
         if not included:
              raise ValueError("No columns selected for comparison.")
 
@@ -486,19 +692,17 @@ class CompareSyncUI(QWidget):
             report = []
             if result.missing_rows_in_target:
                 report.append(f"Additional Rows in SOURCE ({len(result.missing_rows_in_target)}):")
-                report.extend([f"  - {k}" for k in result.missing_rows_in_target])
+                report.extend([f"  - {k}" for k in sorted(result.missing_rows_in_target)])
             else:
                 report.append("No additional rows in Source.")
-                
+
             if result.missing_rows_in_source:
                 report.append(f"\nAdditional Rows in TARGET ({len(result.missing_rows_in_source)}):")
-                report.extend([f"  - {k}" for k in result.missing_rows_in_source])
+                report.extend([f"  - {k}" for k in sorted(result.missing_rows_in_source)])
             else:
                 report.append("\nNo additional rows in Target.")
                 
-            self.report.append("\n=== Row Check Report ===")
-            self.report.append("\n".join(report))
-            self.report.append("========================\n")
+            self._append_report_block(["\n=== Row Check Report ===", *report, "========================\n"])
             QMessageBox.information(self, "Row Check Complete", "Check report for details.")
             
         except Exception as e:
@@ -519,10 +723,29 @@ class CompareSyncUI(QWidget):
         self.busy.emit(True)
         try:
             key, included, sid, stab, tid, ttab, is_source_sheet, update_marker_col = self._get_run_params()
-            s_h, s_r = self._load_table("source")
-            t_h, t_r = self._load_table("target")
+
+            # The "other" sheet provides both the reference values and the
+            # colors copied onto inserted rows — fetch them in one call.
+            other_formats = []
+            if target_kind == "target":
+                if is_source_sheet:
+                    try:
+                        s_h, s_r, other_formats = self.client.fetch_values_and_formats(sid, stab)
+                    except Exception as e:
+                        print(f"Warning: Could not fetch formats from other sheet: {e}")
+                        s_h, s_r = self._load_table("source")
+                else:
+                    s_h, s_r = self._load_table("source")
+                t_h, t_r = self._load_table("target")
+            else:
+                s_h, s_r = self._load_table("source")
+                try:
+                    t_h, t_r, other_formats = self.client.fetch_values_and_formats(tid, ttab)
+                except Exception as e:
+                    print(f"Warning: Could not fetch formats from other sheet: {e}")
+                    t_h, t_r = self._load_table("target")
             result = compare_two_sheets(s_h, s_r, t_h, t_r, key, included)
-            
+
             missing_keys = []
             other_rows = [] # The reference rows (from the other sheet)
             other_hmap = {}
@@ -537,8 +760,6 @@ class CompareSyncUI(QWidget):
                 target_hmap = {h: i for i, h in enumerate(t_h)}
                 target_sheet_id = tid
                 target_tab_name = ttab
-                other_sheet_id = sid if is_source_sheet else None
-                other_tab_name = stab if is_source_sheet else None
             else: # source
                 missing_keys = result.missing_rows_in_source
                 other_rows = t_r
@@ -546,8 +767,6 @@ class CompareSyncUI(QWidget):
                 target_hmap = {h: i for i, h in enumerate(s_h)}
                 target_sheet_id = sid
                 target_tab_name = stab
-                other_sheet_id = tid
-                other_tab_name = ttab
 
             if not missing_keys:
                 QMessageBox.information(self, "No Missing Rows", f"No missing rows found in {target_kind}.")
@@ -556,23 +775,13 @@ class CompareSyncUI(QWidget):
             self.report.append(f"Found {len(missing_keys)} missing rows. Starting insertion...")
             QApplication.processEvents()
 
-            # Fetch formats from "other" if it's a sheet
-            other_formats = []
-            if other_sheet_id and other_tab_name:
-                 try:
-                     other_formats = self.client.fetch_formats(other_sheet_id, other_tab_name)
-                 except Exception as e:
-                     print(f"Warning: Could not fetch formats from other sheet: {e}")
-
             # Prepare data for insertion
             # We iterate through the 'other' rows (reference order)
             # If we find a key that is missing in 'target', we insert it.
             # We track the insertion index.
             
             # 1. Get current target sheet ID for API calls
-            sh = self.client._open_sheet(target_sheet_id)
-            ws = sh.worksheet(target_tab_name)
-            ws_id = ws.id
+            ws_id = self.client._worksheet(target_sheet_id, target_tab_name).id
             
             # 2. Calculate insertion points
             # We assume the target rows are roughly in order or we just append if not found.
@@ -673,9 +882,11 @@ class CompareSyncUI(QWidget):
             if all_color_reqs:
                 self.client.batch_update(target_sheet_id, {'requests': all_color_reqs})
                     
+            if rows_inserted:
+                self._invalidate_table_cache()
             QMessageBox.information(self, "Add Missing Complete", f"Inserted {rows_inserted} rows into {target_kind}.")
             self._write_log(f"Added {rows_inserted} missing rows to {target_kind}.")
-            self._save_ui_state()
+            self._request_save_ui_state()
 
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
@@ -704,9 +915,7 @@ class CompareSyncUI(QWidget):
             else:
                 report.append("\nNo additional columns in Target.")
                 
-            self.report.append("\n=== Column Check Report ===")
-            self.report.append("\n".join(report))
-            self.report.append("===========================\n")
+            self._append_report_block(["\n=== Column Check Report ===", *report, "===========================\n"])
             QMessageBox.information(self, "Column Check Complete", "Check report for details.")
             
         except Exception as e:
@@ -716,164 +925,183 @@ class CompareSyncUI(QWidget):
             self.busy.emit(False)
 
     def _check_only(self):
-        self.busy.emit(True)
         try:
             key, included, _, _, _, _, _, _ = self._get_run_params()
-            s_h, s_r = self._load_table("source")
-            t_h, t_r = self._load_table("target")
-            result = compare_two_sheets(s_h, s_r, t_h, t_r, key, included)
+            load_source = self._table_loader("source")
+            load_target = self._table_loader("target")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", str(e))
+            return
+
+        def work(progress):
+            (s_h, s_r), (t_h, t_r) = _fetch_concurrently(load_source, load_target)
+            return compare_two_sheets(s_h, s_r, t_h, t_r, key, included)
+
+        def done(result):
             self.report.append(result.to_report())
-            
             msg = f"Checked differences. Found {len(result.differences)} rows with differences."
             QMessageBox.information(self, "Check Complete", "Comparison finished. No changes made.")
             self._write_log(msg)
-            self._save_ui_state()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
-            self._set_status_color("red")
-        finally:
-            self.busy.emit(False)
+            self._request_save_ui_state()
+
+        self._run_action(work, done)
 
     def _check_color_only(self):
         """Calculates differences and checks if they are colored in Target."""
-        self.busy.emit(True)
         try:
-            key, included, _, _, tid, ttab, _, _ = self._get_run_params()
-            
-            # 1. Calculate differences (Data comparison)
-            s_h, s_r = self._load_table("source")
-            t_h, t_r = self._load_table("target")
+            key, included, sid, stab, tid, ttab, is_source_sheet, _ = self._get_run_params()
+            if not self._ensure_client(): return
+            load_source = None if is_source_sheet else self._table_loader("source")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", str(e))
+            return
+        client = self.client
+
+        def work(progress):
+            # 1. Load data. With a sheet source all four reads run in
+            # parallel; otherwise target values + colors come in one call.
+            src_formats = None
+            if is_source_sheet:
+                s_h, s_r, src_formats, t_h, t_r, current_formats = \
+                    client.fetch_all_for_compare(sid, stab, tid, ttab)
+            else:
+                (s_h, s_r), (t_h, t_r, current_formats) = _fetch_concurrently(
+                    load_source, lambda: client.fetch_values_and_formats(tid, ttab))
             result = compare_two_sheets(s_h, s_r, t_h, t_r, key, included)
-            
-            # 2. Fetch current colors from Target
-            current_formats = self.client.fetch_formats(tid, ttab)
-            
-            # 3. Compare actual colors vs expected colors
+
+            # 2. Compare actual colors vs expected colors
             # Passing 'included' columns so we ignore colors in other unrelated columns
             color_report = check_color_status(result, current_formats, t_h, included)
-            
-            # NEW: 4. If Source is Sheet, compare Source Colors vs Target Colors
-            if self.src_type.currentText() == "Google Sheet":
-                 sid, stab = self.src_id.text().strip(), self.src_list.currentText()
-                 src_formats = self.client.fetch_formats(sid, stab)
-                 # Compare src_formats vs current_formats (target)
+
+            # 3. If Source is Sheet, compare Source Colors vs Target Colors
+            if src_formats is not None:
                  color_diff_report = compare_sheet_colors(result, src_formats, current_formats, s_h, t_h, included)
                  if color_diff_report:
                      color_report.append("\n--- Source vs Target Color Mismatches ---")
                      color_report.extend(color_diff_report)
+            return color_report
+
+        def done(color_report):
+            self._append_report_block(["\n=== Color Check Report ===", *color_report, "==========================\n"])
 
-            # 4. Report
-            self.report.append("\n=== Color Check Report ===")
-            self.report.append("\n".join(color_report))
-            self.report.append("==========================\n")
-            
             QMessageBox.information(self, "Color Check Complete", "Check the report window for details.")
             self._write_log(f"Checked colors. Found {len(color_report)} issues.")
-            self._save_ui_state()
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
-            self._set_status_color("red")
-        finally:
-            self.busy.emit(False)
+            self._request_save_ui_state()
+
+        self._run_action(work, done)
 
     def _run(self, sync_data: bool, sync_color: bool, sync_source_colors: bool = False):
-        self.busy.emit(True)
         try:
             key, included, sid, stab, tid, ttab, is_source_sheet, update_marker_col = self._get_run_params()
-            s_h, s_r = self._load_table("source")
-            t_h, t_r = self._load_table("target")
+            if not self._ensure_client(): return
+            load_source = None if (sync_source_colors and is_source_sheet) else self._table_loader("source")
+            load_target = None if (sync_source_colors and is_source_sheet) else self._table_loader("target")
+            base_color_name = self.base_color_combo.currentText()
+        except Exception as e:
+            QMessageBox.critical(self, "Run Error", str(e))
+            return
+        client = self.client
+        base_color = BRIGHT_COLORS[base_color_name]
+
+        def work(progress):
+            if sync_source_colors and is_source_sheet:
+                # Values and formats for both sides in parallel.
+                s_h, s_r, src_formats, t_h, t_r, current_formats = \
+                    client.fetch_all_for_compare(sid, stab, tid, ttab)
+            else:
+                (s_h, s_r), (t_h, t_r) = _fetch_concurrently(load_source, load_target)
             result = compare_two_sheets(s_h, s_r, t_h, t_r, key, included)
-            self.report.append(result.to_report())
+            progress(result.to_report())
 
             # If we are syncing source colors, we need to check for color mismatches even if data is identical
             color_mismatches = []
             if sync_source_colors and is_source_sheet:
-                current_formats = self.client.fetch_formats(tid, ttab)
-                src_formats = self.client.fetch_formats(sid, stab)
                 color_mismatches = get_color_mismatches(result, src_formats, current_formats, s_h, t_h, included)
                 if color_mismatches:
-                    self.report.append(f"\nFound {len(color_mismatches)} color mismatches to sync.")
+                    progress(f"\nFound {len(color_mismatches)} color mismatches to sync.")
 
             if not result.differences and not color_mismatches:
-                QMessageBox.information(self, "No Differences", "No data or color differences found to update.")
-                self._save_ui_state()
-                return
+                return None  # nothing to update
 
-            base_color = BRIGHT_COLORS[self.base_color_combo.currentText()]
             value_updates = []
             src_value_updates = []
             log_entries = []
 
-            tgt_sh = self.client._open_sheet(tid)
-            tgt_ws = tgt_sh.worksheet(ttab)
+            tgt_ws = client._worksheet(tid, ttab)
             tgt_sheet_id = tgt_ws.id
-            tgt_color_reqs = []
+            tgt_color_cells = []
             tgt_header_map = {h: i for i, h in enumerate(t_h)}
 
-            src_color_reqs = []
+            src_color_cells = []
             src_header_map = {h: i for i, h in enumerate(s_h)}
             
-            src_sh, src_ws, src_sheet_id = None, None, None
+            src_sheet_id = None
             if is_source_sheet:
-                src_sh = self.client._open_sheet(sid)
-                src_ws = src_sh.worksheet(stab)
-                src_sheet_id = src_ws.id
+                src_sheet_id = client._worksheet(sid, stab).id
+
+            # Constant for the whole run; one string shared by every update.
+            marker_text = f"UPDATE {datetime.now().strftime('%y%m%d')}"
+            tgt_marker_col_idx = tgt_header_map.get(update_marker_col) if update_marker_col else None
+            src_marker_col_idx = src_header_map.get(update_marker_col) if (is_source_sheet and update_marker_col) else None
+
+            # Bound methods hoisted for the hot append sites below; the lists
+            # themselves grow geometrically, so explicit preallocation buys
+            # nothing further.
+            value_append = value_updates.append
+            src_value_append = src_value_updates.append
+            tgt_cell_append = tgt_color_cells.append
+            src_cell_append = src_color_cells.append
+            log_append = log_entries.append
 
             # 1. Handle Data Differences (Highlighting)
             for key_val, diffs in result.differences.items():
-                row_log_entries = []
                 s_row_idx = diffs[0][3]
                 t_row_idx = diffs[0][4]
+                t_row_0 = t_row_idx - 1
+                s_row_0 = s_row_idx - 1
+
+                row_log_entries = []
+                if sync_data:
+                    value_updates.extend((t_row_0, t_col, s_val) for _, s_val, _, _, _, _, t_col in diffs)
+                    row_log_entries = [f"  - {h}: '{t_val}' -> '{s_val}'" for h, s_val, t_val, _, _, _, _ in diffs]
+
+                if sync_color:
+                    # Highlight data differences with Base Color (e.g. Yellow)
+                    tgt_color_cells.extend((t_row_0, t_col, base_color) for *_, t_col in diffs)
+                    if is_source_sheet:
+                        src_color_cells.extend((s_row_0, s_col, base_color) for _, _, _, _, _, s_col, _ in diffs)
                 
-                for h, s_val, t_val, _, _, s_col, t_col in diffs:
+                # Handle Update Marker
+                # 1. Target Update
+                if tgt_marker_col_idx is not None:
+                    marker_row_0 = t_row_idx - 1
+
                     if sync_data:
-                        value_updates.append((t_row_idx - 1, t_col, s_val))
-                        row_log_entries.append(f"  - {h}: '{t_val}' -> '{s_val}'")
+                        value_append((marker_row_0, tgt_marker_col_idx, marker_text))
+                        row_log_entries.append(f"  - {update_marker_col} (Target): Set to '{marker_text}'")
 
                     if sync_color:
-                        # Highlight data difference with Base Color (e.g. Yellow)
-                        tgt_color_reqs.append(self._create_color_request(tgt_sheet_id, t_row_idx - 1, t_col, base_color))
+                        tgt_cell_append((marker_row_0, tgt_marker_col_idx, base_color))
 
-                        if is_source_sheet:
-                            src_color_reqs.append(self._create_color_request(src_sheet_id, s_row_idx - 1, s_col, base_color))
-                
-                # Handle Update Marker
-                if update_marker_col:
-                    marker_text = f"UPDATE {datetime.now().strftime('%y%m%d')}"
-                    
-                    # 1. Target Update
-                    if update_marker_col in tgt_header_map:
-                        marker_col_idx = tgt_header_map[update_marker_col]
-                        marker_row_0 = t_row_idx - 1
-                        
-                        if sync_data:
-                            value_updates.append((marker_row_0, marker_col_idx, marker_text))
-                            row_log_entries.append(f"  - {update_marker_col} (Target): Set to '{marker_text}'")
-                        
-                        if sync_color:
-                            tgt_color_reqs.append(self._create_color_request(tgt_sheet_id, marker_row_0, marker_col_idx, base_color))
+                # 2. Source Update (Decoupled from target check)
+                if src_marker_col_idx is not None:
+                    marker_row_0 = s_row_idx - 1
 
-                    # 2. Source Update (Decoupled from target check)
-                    if is_source_sheet and update_marker_col in src_header_map:
-                        marker_col_idx = src_header_map[update_marker_col]
-                        marker_row_0 = s_row_idx - 1
-                        
-                        if sync_data:
-                            src_value_updates.append((marker_row_0, marker_col_idx, marker_text))
-                            row_log_entries.append(f"  - {update_marker_col} (Source): Set to '{marker_text}'")
-                            
-                        if sync_color:
-                            src_color_reqs.append(self._create_color_request(src_sheet_id, marker_row_0, marker_col_idx, base_color))
+                    if sync_data:
+                        src_value_append((marker_row_0, src_marker_col_idx, marker_text))
+                        row_log_entries.append(f"  - {update_marker_col} (Source): Set to '{marker_text}'")
+
+                    if sync_color:
+                        src_cell_append((marker_row_0, src_marker_col_idx, base_color))
 
                 if row_log_entries:
-                    log_entries.append(f"Row [{key_val}]:\n" + "\n".join(row_log_entries))
+                    log_append(f"Row [{key_val}]:\n" + "\n".join(row_log_entries))
 
             # 2. Handle Color Mismatches (Syncing Source Colors)
             if sync_source_colors and color_mismatches:
                 for t_row_0, t_col_0, s_color, desc in color_mismatches:
                     # Add request to set Target cell to Source Color
-                    tgt_color_reqs.append(self._create_color_request(tgt_sheet_id, t_row_0, t_col_0, s_color))
+                    tgt_color_cells.append((t_row_0, t_col_0, s_color))
                     log_entries.append(f"Color Sync: {desc}")
 
             # Helper for chunked execution with progress
@@ -881,58 +1109,64 @@ class CompareSyncUI(QWidget):
                 chunk_size = 50
                 total = len(items)
                 if total == 0: return
-                
-                self.report.append(f"Starting {action_name} ({total} items)...")
-                QApplication.processEvents()
-                
+
+                progress(f"Starting {action_name} ({total} items)...")
                 for i in range(0, total, chunk_size):
                     chunk = items[i:i + chunk_size]
                     processor_func(chunk)
-                    self.report.append(f"  - Processed {min(i + chunk_size, total)}/{total}")
-                    QApplication.processEvents()
+                    progress(f"  - Processed {min(i + chunk_size, total)}/{total}")
                     time.sleep(0.5) # Throttle
 
-            if sync_data: 
-                process_in_chunks(value_updates, "Target Data Sync", 
-                                  lambda c: self.client.batch_update_values(tid, ttab, c))
+            if sync_data:
+                process_in_chunks(value_updates, "Target Data Sync",
+                                  lambda c: client.batch_update_values(tid, ttab, c))
                 if src_value_updates:
-                    process_in_chunks(src_value_updates, "Source Data Sync", 
-                                      lambda c: self.client.batch_update_values(sid, stab, c))
+                    process_in_chunks(src_value_updates, "Source Data Sync",
+                                      lambda c: client.batch_update_values(sid, stab, c))
 
             if sync_color or sync_source_colors:
-                self.report.append(f"DEBUG: Base Color: {self.base_color_combo.currentText()} {base_color}")
-                self.report.append(f"DEBUG: Generated {len(tgt_color_reqs)} color requests for Target.")
+                tgt_color_reqs = self._build_color_requests(tgt_sheet_id, tgt_color_cells)
+                src_color_reqs = self._build_color_requests(src_sheet_id, src_color_cells) if is_source_sheet else []
+                progress(f"DEBUG: Base Color: {base_color_name} {base_color}")
+                progress(f"DEBUG: Generated {len(tgt_color_reqs)} color requests for {len(tgt_color_cells)} Target cells.")
                 if is_source_sheet:
-                    self.report.append(f"DEBUG: Generated {len(src_color_reqs)} color requests for Source.")
+                    progress(f"DEBUG: Generated {len(src_color_reqs)} color requests for {len(src_color_cells)} Source cells.")
 
-                if tgt_color_reqs: 
-                    process_in_chunks(tgt_color_reqs, "Target Color Sync", 
-                                      lambda c: self.client.batch_update(tid, {'requests': c}))
-                if src_color_reqs: 
-                    process_in_chunks(src_color_reqs, "Source Color Sync", 
-                                      lambda c: self.client.batch_update(sid, {'requests': c}))
+                if tgt_color_reqs:
+                    process_in_chunks(tgt_color_reqs, "Target Color Sync",
+                                      lambda c: client.batch_update(tid, {'requests': c}))
+                if src_color_reqs:
+                    process_in_chunks(src_color_reqs, "Source Color Sync",
+                                      lambda c: client.batch_update(sid, {'requests': c}))
 
             action_parts = []
             if sync_data: action_parts.append("Synced")
             if sync_color: action_parts.append("Colored")
             if sync_source_colors: action_parts.append("Color-Matched")
             action = " & ".join(action_parts) if action_parts else "Checked"
-            
+
             summary_message = f"{action} {len(result.differences)} data diffs, {len(color_mismatches)} color diffs."
+            return summary_message, log_entries
+
+        def done(outcome):
+            if outcome is None:
+                QMessageBox.information(self, "No Differences", "No data or color differences found to update.")
+                self._request_save_ui_state()
+                return
+            summary_message, log_entries = outcome
+            if sync_data:
+                self._invalidate_table_cache()  # target values just changed
             QMessageBox.information(self, "Run Complete", summary_message)
-            
+
             if (sync_data or sync_source_colors) and log_entries:
                 log_header = f"Ran 'Sync' on {len(log_entries)} items."
                 self._write_log(f"{log_header}\n{'\n'.join(log_entries)}")
             else:
                  self._write_log(summary_message)
-                 
-            self._save_ui_state()
-        except Exception as e:
-            QMessageBox.critical(self, "Run Error", str(e))
-            self._set_status_color("red")
-        finally:
-            self.busy.emit(False)
+
+            self._request_save_ui_state()
+
+        self._run_action(work, done, "Run Error")
 
     def _snapshot_tab(self):
         if not self._ensure_client(): return
@@ -1037,37 +1271,48 @@ class CompareSyncUI(QWidget):
                                      QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
         if reply != QMessageBox.StandardButton.Yes: return
 
-        self.busy.emit(True)
         try:
-            sid, stab = self.src_id.text().strip(), self.src_list.currentText()
-            tid, ttab = self.tgt_id.text().strip(), self.tgt_list.currentText()
-
-            if kind == "source":
-                if self.src_type.currentText() != "Google Sheet":
-                    raise ValueError("Cannot clear colors on a non-sheet source.")
-                sheet_id, sheet_tab = sid, stab
-            else:
-                sheet_id, sheet_tab = tid, ttab
+            sheet_id, sheet_tab = self._color_action_target(kind)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", str(e))
+            return
+        client = self.client
 
-            if not sheet_id or not sheet_tab:
-                raise ValueError(f"The {kind} sheet/tab is not specified.")
-                
-            sh = self.client._open_sheet(sheet_id)
-            ws = sh.worksheet(sheet_tab)
+        def work(progress):
+            ws = client._worksheet(sheet_id, sheet_tab)
             req = {"repeatCell": {"range": {"sheetId": ws.id, "startRowIndex": 1}, "cell": {"userEnteredFormat": {"backgroundColor": WHITE}}, "fields": "userEnteredFormat.backgroundColor"}}
-            self.client.batch_update(sheet_id, {"requests": [req]})
+            client.batch_update(sheet_id, {"requests": [req]})
+
+        def done(_):
             QMessageBox.information(self, "Colors Cleared", f"Background colors cleared in {kind} sheet '{sheet_tab}'.")
             self._write_log(f"Cleared all background colors in {kind} sheet.")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
-            self._set_status_color("red")
-        finally:
-            self.busy.emit(False)
+
+        self._run_action(work, done)
+
+    def _color_action_target(self, kind: str) -> Tuple[str, str]:
+        """Resolves which sheet/tab a clear/dim action applies to."""
+        if kind == "source":
+            if self.src_type.currentText() != "Google Sheet":
+                raise ValueError("Cannot modify colors on a non-sheet source.")
+            sheet_id, sheet_tab = self.src_id.text().strip(), self.src_list.currentText()
+        else:
+            sheet_id, sheet_tab = self.tgt_id.text().strip(), self.tgt_list.currentText()
+        if not sheet_id or not sheet_tab:
+            raise ValueError(f"The {kind} sheet/tab is not specified.")
+        return sheet_id, sheet_tab
 
     def _create_color_request(self, sheet_id, row_idx, col_idx, color):
         return {"repeatCell": {"range": {"sheetId": sheet_id, "startRowIndex": row_idx, "endRowIndex": row_idx + 1, "startColumnIndex": col_idx, "endColumnIndex": col_idx + 1},
                                "cell": {"userEnteredFormat": {"backgroundColor": color}}, "fields": "userEnteredFormat.backgroundColor"}}
 
+    def _build_color_requests(self, sheet_id, cells):
+        """Coalesces (row0, col0, color) cell entries into one repeatCell
+        request per same-color rectangle (diffs cluster within rows/columns,
+        so this typically shrinks the batch severalfold)."""
+        return [{"repeatCell": {"range": {"sheetId": sheet_id, "startRowIndex": r0, "endRowIndex": r1, "startColumnIndex": c0, "endColumnIndex": c1},
+                                "cell": {"userEnteredFormat": {"backgroundColor": color}}, "fields": "userEnteredFormat.backgroundColor"}}
+                for r0, r1, c0, c1, color in _coalesce_color_cells(cells)]
+
     def _dim_colors(self, kind: str):
         if not self._ensure_client(): return
 
@@ -1076,71 +1321,64 @@ class CompareSyncUI(QWidget):
                                      QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
         if reply != QMessageBox.StandardButton.Yes: return
 
-        self.busy.emit(True)
         try:
-            sid, stab = self.src_id.text().strip(), self.src_list.currentText()
-            tid, ttab = self.tgt_id.text().strip(), self.tgt_list.currentText()
-
-            if kind == "source":
-                if self.src_type.currentText() != "Google Sheet":
-                    raise ValueError("Cannot dim colors on a non-sheet source.")
-                sheet_id, sheet_tab = sid, stab
-            else:
-                sheet_id, sheet_tab = tid, ttab
+            sheet_id, sheet_tab = self._color_action_target(kind)
+        except Exception as e:
+            QMessageBox.critical(self, "Dim Error", str(e))
+            return
+        client = self.client
 
-            if not sheet_id or not sheet_tab:
-                raise ValueError(f"The {kind} sheet/tab is not specified.")
+        def work(progress):
+            worksheet_api_id = client._worksheet(sheet_id, sheet_tab).id
 
-            sh = self.client._open_sheet(sheet_id)
-            ws = sh.worksheet(sheet_tab)
-            worksheet_api_id = ws.id
-            
-            all_row_data = self.client.fetch_formats(sheet_id, sheet_tab)
+            all_row_data = client.fetch_formats(sheet_id, sheet_tab)
             if not all_row_data:
-                QMessageBox.information(self, "No Data", f"Could not retrieve format data from {kind}.")
-                return
+                return None  # no format data at all
 
-            color_requests = []
+            dim_cells = []
+            # Locals for the per-cell walk; every name below is hit once per cell.
+            _is_white, _dim, _append = is_white, dim_color, dim_cells.append
             for r_idx, row_data in enumerate(all_row_data, start=1):
-                if 'values' not in row_data: continue
-                for c_idx, cell_data in enumerate(row_data['values']):
-                    if not cell_data or 'effectiveFormat' not in cell_data: continue
-                    color = cell_data['effectiveFormat'].get('backgroundColor')
-                    if not is_white(color):
-                        r, g, b = color.get('red', 0.0), color.get('green', 0.0), color.get('blue', 0.0)
-                        h, s, v = rgb_to_hsv(r, g, b)
-                        new_s = max(0.0, s - DIM_BLEND_FACTOR)
-                        if s > 0.85: new_v = v - 0.18
-                        elif s > 0.45: new_v = v - 0.05
-                        elif s > 0.15: new_v = v + 0.05
-                        else: new_v = min(1.0, v + (0.15 - new_s) * 1.8)
-                        new_v = max(0.0, min(1.0, new_v))
-                        new_r, new_g, new_b = hsv_to_rgb(h, new_s, new_v)
-                        new_color = {"red": new_r, "green": new_g, "blue": new_b}
-                        if new_s < 0.01: new_color = WHITE
-                        color_requests.append(self._create_color_request(worksheet_api_id, r_idx, c_idx, new_color))
-            
-            if not color_requests:
+                values = row_data.get('values')
+                if not values: continue
+                for c_idx, cell_data in enumerate(values):
+                    ef = cell_data.get('effectiveFormat') if cell_data else None
+                    color = ef.get('backgroundColor') if ef else None
+                    if color is None or _is_white(color): continue
+                    r, g, b = color.get('red', 0.0), color.get('green', 0.0), color.get('blue', 0.0)
+                    new_r, new_g, new_b = _dim(r, g, b)
+                    if abs(new_r - r) + abs(new_g - g) + abs(new_b - b) < 2e-3:
+                        continue  # already at the dim steady state; skip the no-op write
+                    _append((r_idx, c_idx, {"red": round(new_r, 3), "green": round(new_g, 3), "blue": round(new_b, 3)}))
+
+            if not dim_cells:
+                return 0
+
+            color_requests = self._build_color_requests(worksheet_api_id, dim_cells)
+            client.batch_update(sheet_id, {"requests": color_requests})
+            return len(dim_cells)
+
+        def done(count):
+            if count is None:
+                QMessageBox.information(self, "No Data", f"Could not retrieve format data from {kind}.")
+            elif count == 0:
                 QMessageBox.information(self, "No Colors", f"No colored cells found to dim in {kind} sheet.")
-                return
-                
-            self.client.batch_update(sheet_id, {"requests": color_requests})
-            QMessageBox.information(self, "Dim Complete", f"Successfully dimmed {len(color_requests)} cells.")
-            self._write_log(f"Dimmed {len(color_requests)} colored cells in {kind} sheet.")
+            else:
+                QMessageBox.information(self, "Dim Complete", f"Successfully dimmed {count} cells.")
+                self._write_log(f"Dimmed {count} colored cells in {kind} sheet.")
 
-        except Exception as e:
-            QMessageBox.critical(self, "Dim Error", str(e))
-            self._set_status_color("red")
-        finally:
-            if self.progress.isVisible(): self.busy.emit(False)
+        self._run_action(work, done, "Dim Error")
 
     # --- State Management ---
     def _get_target_base_filename(self) -> Optional[str]:
         tid, ttab = self.tgt_id.text().strip(), self.tgt_list.currentText()
         if not tid or not ttab: return None
-        tid_safe = re.sub(r'[\\/*?:"<>|]', "_", tid)
-        ttab_safe = re.sub(r'[\\/*?:"<>|]', "_", ttab)
-        return f"gspread__{tid_safe}__{ttab_safe}"
+        cached = self._basename_cache
+        if cached is not None and cached[0] == (tid, ttab):
+            return cached[1]
+        basename = f"gspread__{_SANITIZE_RE.sub('_', tid)}__{_SANITIZE_RE.sub('_', ttab)}"
+        self._basename_cache = ((tid, ttab), basename)
+        return basename
     
     def _on_target_change(self, current_text: str):
         if not current_text: return
@@ -1152,16 +1390,17 @@ class CompareSyncUI(QWidget):
         self._load_tgt_tabs()
         self._populate_key_headers()
         
+    def _request_save_ui_state(self):
+        """Schedules a debounced state save; bursts collapse into one write."""
+        self._save_timer.start()
+
     def _save_ui_state(self):
         basename = self._get_target_base_filename()
         if not basename: return
 
-        # Collect headers from list widget
-        compare_headers = []
-        for i in range(self.compare_list.count()):
-            item = self.compare_list.item(i)
-            if item.checkState() == Qt.Checked:
-                compare_headers.append(item.text())
+        # Checked headers come from the mirror, not the widget (see
+        # _on_compare_item_changed), so saving never walks Qt items.
+        compare_headers = [h for h, checked in zip(self._headers, self._check_state) if checked]
 
         state_file_path = os.path.join(CONFIG_PATH, f"{basename}.json")
         data = {
@@ -1179,15 +1418,14 @@ class CompareSyncUI(QWidget):
             }
         }
         try:
-            with open(state_file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-            
+            _write_json(state_file_path, data)
+            self._state_cache[state_file_path] = (os.path.getmtime(state_file_path), data)
+
             last_session_data = {
                 "last_credentials_path": self.cred_edit.text(),
                 "last_target_config_basename": f"{basename}.json"
             }
-            with open(LAST_SESSION_CONFIG, 'w', encoding='utf-8') as f:
-                json.dump(last_session_data, f, indent=2)
+            _write_json(LAST_SESSION_CONFIG, last_session_data)
 
         except Exception as e:
             print(f"Warning: Could not save UI state: {e}")
@@ -1199,11 +1437,16 @@ class CompareSyncUI(QWidget):
             config_basename = f"{basename}.json"
 
         state_file = os.path.join(CONFIG_PATH, config_basename)
-        if not os.path.isfile(state_file): return
-
         try:
-            with open(state_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # Targets get revisited constantly while switching tabs; reuse the
+            # parsed state as long as the file on disk has not changed.
+            mtime = os.path.getmtime(state_file)
+            hit = self._state_cache.get(state_file)
+            if hit is not None and hit[0] == mtime:
+                data = hit[1]
+            else:
+                data = _read_json(state_file)
+                self._state_cache[state_file] = (mtime, data)
 
             self.base_color_combo.setCurrentText(data.get("base_color_name", DEFAULT_COLOR_NAME))
             
@@ -1212,31 +1455,47 @@ class CompareSyncUI(QWidget):
             self.saved_marker_col = data.get("update_marker_col", "")
 
             snap = data.get("ui_snapshot", {})
-            self.tgt_id.setText(snap.get("tgt_id", ""))
-            self.src_id.setText(snap.get("src_id", ""))
-            self.src_file.setText(snap.get("src_file", ""))
-            self.src_type.setCurrentText(snap.get("src_type", "Google Sheet"))
-
-            if saved_tgt_tab := snap.get("tgt_tab"): self.tgt_list.setCurrentText(saved_tgt_tab)
-            if saved_src_tab := snap.get("src_tab"): self.src_list.setCurrentText(saved_src_tab)
-            if saved_key_header := snap.get("key_header"): self.key_header.setCurrentText(saved_key_header)
+            # Each setText/setCurrentText below fires a change signal (cache
+            # invalidation, _on_target_change re-entering this method); block
+            # them for the burst and apply the side effects once afterwards.
+            blockers = [QSignalBlocker(w) for w in (
+                self.src_type, self.src_id, self.src_file,
+                self.tgt_id, self.tgt_list, self.src_list, self.key_header)]
+            try:
+                self.tgt_id.setText(snap.get("tgt_id", ""))
+                self.src_id.setText(snap.get("src_id", ""))
+                self.src_file.setText(snap.get("src_file", ""))
+                self.src_type.setCurrentText(snap.get("src_type", "Google Sheet"))
+
+                if saved_tgt_tab := snap.get("tgt_tab"): self.tgt_list.setCurrentText(saved_tgt_tab)
+                if saved_src_tab := snap.get("src_tab"): self.src_list.setCurrentText(saved_src_tab)
+                if saved_key_header := snap.get("key_header"): self.key_header.setCurrentText(saved_key_header)
+            finally:
+                del blockers
+            self._refresh_source_visibility(self.src_type.currentText())
+            self._invalidate_table_cache()
 
             self.report.append(f"\nLoaded saved state from {os.path.basename(state_file)}")
             self._set_status_color("green")
 
+        except FileNotFoundError:
+            return  # no saved state for this target yet
         except Exception as e:
             QMessageBox.warning(self, "State Load Error", f"Could not load state from {state_file}: {e}")
 
     def _load_last_session_on_startup(self):
-        if not os.path.isfile(LAST_SESSION_CONFIG): return
         try:
-            with open(LAST_SESSION_CONFIG, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _read_json(LAST_SESSION_CONFIG)
             if creds_path := data.get("last_credentials_path"): self.cred_edit.setText(creds_path)
             if data.get("last_target_config_basename"):
                 self._load_ui_state(data["last_target_config_basename"])
-                self._load_all_data()
+                # Let the restored-state paint land before the network fetches
+                # start; the window appears populated immediately instead of
+                # freezing until the Sheets API answers.
+                QTimer.singleShot(0, self._load_all_data)
             self.report.append("Loaded settings from last session.")
+        except FileNotFoundError:
+            return  # first launch: nothing saved yet
         except Exception as e:
             QMessageBox.warning(self, "Last Session Load Error", f"Could not load last session settings: {e}")
 
@@ -1244,24 +1503,32 @@ class CompareSyncUI(QWidget):
         basename = self._get_target_base_filename()
         if not basename: return
         log_file = os.path.join(LOG_PATH, f"{basename}.log")
-        timestamp = dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = dt.datetime.now().isoformat(sep=' ', timespec='seconds')
         src_info = ""
         if self.src_type.currentText() == "Google Sheet":
             src_info = f"Source: [Sheet] {self.src_id.text()}/{self.src_list.currentText()}"
         else:
             src_info = f"Source: [TSV] {os.path.basename(self.src_file.text())}"
 
-        log_line = f"{timestamp} | {src_info}\n{message}\n"
-        try:
-            existing_content = ""
-            if os.path.exists(log_file):
-                with open(log_file, 'r', encoding='utf-8') as f: existing_content = f.read()
-            with open(log_file, 'w', encoding='utf-8') as f:
-                f.write(log_line)
-                f.write("-" * 80 + "\n")
-                f.write(existing_content)
-        except Exception as e:
-            print(f"Warning: Could not write to log file {log_file}: {e}")
+        record = f"{timestamp} | {src_info}\n{message}\n{_LOG_SEP}"
+        # The record is built here (widget reads must stay on the GUI thread)
+        # but written by the log thread; appends are O(1) and ordering is
+        # reconstructed newest-first at read time.
+        self._log_queue.put((log_file, record))
+
+    def _drain_log_queue(self):
+        """Runs on the log writer thread: appends queued records to their
+        files until the shutdown sentinel (None) arrives."""
+        while True:
+            item = self._log_queue.get()
+            if item is None:
+                break
+            log_file, record = item
+            try:
+                with open(log_file, 'a', encoding='utf-8') as f:
+                    f.write(record)
+            except Exception as e:
+                print(f"Warning: Could not write to log file {log_file}: {e}")
 
     def _load_log_file(self):
         basename = self._get_target_base_filename()
@@ -1269,11 +1536,32 @@ class CompareSyncUI(QWidget):
             QMessageBox.warning(self, "No Target", "Select a target sheet to load its log.")
             return
         log_file = os.path.join(LOG_PATH, f"{basename}.log")
-        if not os.path.isfile(log_file):
-            self.report.setPlainText("No log file found for this target.")
-            return
         try:
-            with open(log_file, 'r', encoding='utf-8') as f: self.report.setPlainText(f.read())
-            self.report.insertPlainText(f"Log for {basename}:\n" + "="*40 + "\n")
+            # Only the newest entries are displayed anyway, so read just the
+            # tail of a large log instead of pulling the whole file into RAM.
+            size = os.path.getsize(log_file)
+            truncated = size > LOG_TAIL_BYTES
+            with open(log_file, 'rb') as f:
+                if truncated:
+                    f.seek(size - LOG_TAIL_BYTES)
+                content = f.read().decode('utf-8', errors='replace')
+            entries = [e for e in content.split(_LOG_SEP) if e.strip()]
+            if truncated and entries:
+                entries = entries[1:]  # the seek likely landed mid-entry
+            self.report.setPlainText("".join(e + _LOG_SEP for e in reversed(entries)))
+            header = f"Log for {basename}:\n"
+            if truncated:
+                header += "(large log: showing most recent entries only)\n"
+            self.report.insertPlainText(header + "="*40 + "\n")
+        except FileNotFoundError:
+            self.report.setPlainText("No log file found for this target.")
         except Exception as e:
-            QMessageBox.critical(self, "Log Error", f"Could not read log file: {e}")
\ No newline at end of file
+            QMessageBox.critical(self, "Log Error", f"Could not read log file: {e}")
+
+    def closeEvent(self, event):
+        if self._save_timer.isActive():
+            self._save_timer.stop()
+            self._save_ui_state()  # flush a pending debounced save
+        self._log_queue.put(None)  # sentinel: flush and stop the log thread
+        self._log_thread.join(timeout=2.0)
+        super().closeEvent(event)
\ No newline at end of file
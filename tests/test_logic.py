@@ -7,7 +7,11 @@ import unittest
 # This adds the parent directory (project root) to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.logic import normalize_cell, compare_two_sheets, CompareResult
+from src.logic import (
+    normalize_cell, compare_two_sheets, CompareResult,
+    _coalesce_value_updates, _coalesce_value_updates_by_row, dim_color,
+    _coalesce_color_cells, _reassemble_column_rows,
+)
 
 class TestLogic(unittest.TestCase):
     def test_normalize_cell_floats(self):
@@ -17,8 +21,19 @@ class TestLogic(unittest.TestCase):
         
     def test_normalize_cell_dates(self):
         # Assuming ISO format output
-        self.assertEqual(normalize_cell("2023-12-25"), "2023-12-25")
-        self.assertEqual(normalize_cell("25/12/2023"), "2023-12-25")
+        cases = [
+            ("2023-12-25", "2023-12-25"),
+            ("25/12/2023", "2023-12-25"),
+            ("25.12.2023", "2023-12-25"),
+            ("2023/12/25", "2023-12-25"),
+            # Ambiguous slash dates resolve month-first, like the old strptime order
+            ("03/04/2023", "2023-03-04"),
+            # Not a real date: passes through untouched
+            ("99/99/2023", "99/99/2023"),
+        ]
+        for raw, expected in cases:
+            with self.subTest(raw=raw):
+                self.assertEqual(normalize_cell(raw), expected)
         
     def test_compare_two_sheets_basic(self):
         s_h = ["ID", "Value", "Ignored"]
@@ -43,5 +58,57 @@ class TestLogic(unittest.TestCase):
         self.assertEqual(diff[1], "Banana")
         self.assertEqual(diff[2], "Cherry")
 
+    def test_compare_two_sheets_equal_raw_values_short_circuit(self):
+        # Byte-identical raw values must never diff, and equivalent values in
+        # different notations must still normalize to equal.
+        s_h = t_h = ["ID", "Amount"]
+        s_r = [["1", "1.000,00"], ["2", "n/a"]]
+        t_r = [["1", "1,000.00"], ["2", "n/a"]]
+        res = compare_two_sheets(s_h, s_r, t_h, t_r, "ID", ["Amount"])
+        self.assertEqual(res.differences, {})
+
+    def test_dim_color(self):
+        # Bright yellow desaturates and darkens a step
+        r, g, b = dim_color(1.0, 1.0, 0.0)
+        self.assertLess(b, 1.0)
+        self.assertGreater(b, 0.0)  # saturation dropped, blue channel rises from 0
+        # Nearly-grey colors snap to white once saturation is fully faded
+        self.assertEqual(dim_color(0.95, 0.95, 0.94), (1.0, 1.0, 1.0))
+
+    def test_coalesce_value_updates(self):
+        updates = [(2, 0, "a"), (3, 0, "b"), (5, 0, "c"), (2, 1, "d")]
+        runs = _coalesce_value_updates(updates)
+        self.assertEqual(runs, [[2, 0, ["a", "b"]], [5, 0, ["c"]], [2, 1, ["d"]]])
+
+    def test_coalesce_value_updates_by_row(self):
+        updates = [(2, 3, "a"), (2, 4, "b"), (2, 6, "c"), (3, 3, "d")]
+        runs = _coalesce_value_updates_by_row(updates)
+        self.assertEqual(runs, [[2, 3, ["a", "b"]], [2, 6, ["c"]], [3, 3, ["d"]]])
+
+    def test_reassemble_column_rows(self):
+        # 4 headers, columns 0 and 2 fetched; column 2 is shorter and has an
+        # empty cell, so rows pad out with "" where nothing came back.
+        col_values = [
+            [["a1"], ["a2"], ["a3"]],  # column 0
+            [["c1"], []],              # column 2: row 2 empty, row 3 missing
+        ]
+        rows = _reassemble_column_rows(4, [0, 2], col_values)
+        self.assertEqual(rows, [
+            ["a1", "", "c1", ""],
+            ["a2", "", "", ""],
+            ["a3", "", "", ""],
+        ])
+        self.assertEqual(_reassemble_column_rows(4, [0, 2], []), [])
+
+    def test_coalesce_color_cells(self):
+        y = {"red": 1.0, "green": 1.0, "blue": 0.0}
+        b = {"red": 0.0, "green": 0.6, "blue": 1.0}
+        # 2x2 yellow block plus one blue outlier -> two rectangles
+        cells = [(1, 1, y), (1, 2, y), (2, 1, y), (2, 2, y), (1, 4, b)]
+        rects = _coalesce_color_cells(cells)
+        self.assertEqual(len(rects), 2)
+        self.assertIn((1, 3, 1, 3, y), rects)
+        self.assertIn((1, 2, 4, 5, b), rects)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file